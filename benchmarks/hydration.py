@@ -0,0 +1,48 @@
+# rows/sec for each hydration mode of a plain select, using canned records instead of a database
+#
+#   python -m benchmarks.hydration 100000
+
+from __future__ import annotations
+
+import sys
+import time
+from typing import Any, Annotated, Callable
+
+import orm
+from orm.query.hydrate import hydrator, identity, view
+
+
+class BenchRow(orm.Table, table_name="bench_hydration"):
+    id: Annotated[orm.Int, orm.primary()]
+    name: orm.Text
+    email: orm.Text
+    score: orm.Double
+    visits: orm.BigInt
+
+
+def records(count: int) -> list[tuple[Any, ...]]:
+    # tuples stand in for asyncpg.Record, both are read by position in C
+    return [(i, f"user {i}", f"user{i}@example.com", i / 7, i * 31) for i in range(count)]
+
+
+def measure(label: str, rows: list[Any], hydrate: Callable[[Any], Any]) -> None:
+    start = time.perf_counter()
+    [hydrate(row) for row in rows]
+    elapsed = time.perf_counter() - start
+
+    print(f"{label:<12} {len(rows) / elapsed:>14,.0f} rows/s")
+
+
+def main(count: int) -> None:
+    rows = records(count)
+    names = [column.name for column in BenchRow._metadata.columns]
+
+    # the previous hydration path, unpacking each record as a mapping
+    measure("kwargs", [dict(zip(names, row)) for row in rows], lambda record: BenchRow(**record))
+    measure("rows", rows, hydrator(BenchRow))
+    measure("views", rows, view(BenchRow))
+    measure("raw", rows, identity)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,66 @@
+# compares per-row inserts against Table.insert_many
+#
+#   ORM_BENCH_DSN=postgres://localhost/bench python -m benchmarks.insert_many 100000
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+from typing import Annotated, Awaitable, Callable
+
+import asyncpg
+
+import orm
+
+
+class BenchRow(orm.Table, table_name="bench_insert_many"):
+    id: Annotated[orm.Int, orm.primary()]
+    name: orm.Text
+    score: orm.Double
+
+
+def rows(count: int) -> list[BenchRow]:
+    return [BenchRow(id=i, name=f"row {i}", score=i / 3) for i in range(count)]
+
+
+async def timed(conn: asyncpg.Connection[asyncpg.Record], label: str, count: int, run: Callable[[], Awaitable[object]]) -> None:
+    await conn.execute("truncate bench_insert_many")
+
+    start = time.perf_counter()
+    await run()
+    elapsed = time.perf_counter() - start
+
+    print(f"{label:<24} {count:>9} rows {elapsed:>9.3f}s {count / elapsed:>12.0f} rows/s")
+
+
+async def main(count: int) -> None:
+    conn = await asyncpg.connect(os.environ["ORM_BENCH_DSN"])
+
+    try:
+        await conn.execute("drop table if exists bench_insert_many")
+        await conn.execute(BenchRow.create().build()[0])
+
+        async def per_row() -> None:
+            async with conn.transaction():
+                for row in rows(count):
+                    await row.insert().execute(conn)
+
+        async def copy() -> None:
+            await BenchRow.insert_many(rows(count)).execute(conn)
+
+        async def values() -> None:
+            await BenchRow.insert_many(rows(count)).fetch(conn)
+
+        await timed(conn, "insert() per row", count, per_row)
+        await timed(conn, "insert_many() copy", count, copy)
+        await timed(conn, "insert_many() returning", count, values)
+
+    finally:
+        await conn.execute("drop table if exists bench_insert_many")
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000))
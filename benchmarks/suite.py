@@ -0,0 +1,269 @@
+# query compilation, row construction and hydration benchmarks, plus round trips when a database is available
+#
+#   python -m benchmarks.suite --json results.json
+#   python -m benchmarks.suite --json after.json --compare results.json
+#   ORM_BENCH_DSN=postgres://localhost/bench python -m benchmarks.suite --rows 10000,1000000
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Annotated, Any, Awaitable, Callable
+
+import orm
+from benchmarks.hydration import records
+from orm.query.compiler import query_cache
+
+
+class BenchAccount(orm.Table, table_name="bench_account"):
+    id: Annotated[orm.Int, orm.primary()]
+    username: orm.Text
+    email: orm.Text
+    score: orm.Double
+    visits: orm.BigInt
+
+
+class BenchPost(orm.Table, table_name="bench_post"):
+    id: Annotated[orm.Int, orm.primary()]
+    author: Annotated[orm.Int, orm.foreign(BenchAccount.id)]
+    content: orm.Text
+
+
+def join_records(count: int) -> list[tuple[Any, ...]]:
+    return [(i, i % 1000, f"post {i}", i % 1000, f"user {i}", f"user{i}@example.com", i / 7, i * 31) for i in range(count)]
+
+
+class FakeConnection:
+    # answers every query with the same canned records, so only the orm side is measured
+    def __init__(self, records: list[tuple[Any, ...]]) -> None:
+        self.records = records
+
+    async def fetch(self, query: str, *args: Any) -> list[tuple[Any, ...]]:
+        return self.records
+
+    async def fetchrow(self, query: str, *args: Any) -> tuple[Any, ...] | None:
+        return self.records[0] if self.records else None
+
+    async def execute(self, query: str, *args: Any) -> str:
+        return f"UPDATE {len(self.records)}"
+
+    def is_in_transaction(self) -> bool:
+        return False
+
+
+class Results:
+    def __init__(self) -> None:
+        self.results: list[dict[str, Any]] = []
+
+    def add(self, name: str, unit: str, value: float, **extra: Any) -> None:
+        self.results.append({"name": name, "unit": unit, "value": value, **extra})
+        print(f"{name:<44} {value:>14,.3f} {unit}")
+
+
+def measure(run: Callable[[], object], number: int, repeat: int = 5) -> float:
+    # best of repeat, the minimum is the least noisy estimate of what the code itself costs
+    timings: list[float] = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+
+        for _ in range(number):
+            run()
+
+        timings.append((time.perf_counter() - start) / number)
+
+    return min(timings)
+
+
+def measure_async(run: Callable[[], Awaitable[object]], repeat: int = 3) -> float:
+    async def timed() -> float:
+        start = time.perf_counter()
+        await run()
+        return time.perf_counter() - start
+
+    return min(asyncio.run(timed()) for _ in range(repeat))
+
+
+def builders() -> dict[str, Callable[[], Any]]:
+    accounts = [BenchAccount(id=i, username=f"user {i}", email=f"user{i}@example.com", score=0.5, visits=i) for i in range(100)]
+
+    return {
+        "select": lambda: BenchAccount.select(),
+        "select where": lambda: BenchAccount.where(BenchAccount.id == 1).and_where(BenchAccount.score > 0.5),
+        "select in": lambda: BenchAccount.where(BenchAccount.id.in_([1, 2, 3])),
+        "select group": lambda: BenchAccount.where((BenchAccount.id < 10) | BenchAccount.email.is_null()).order_by_desc(BenchAccount.score).limit(50),
+        "select join": lambda: BenchPost.where(BenchPost.id > 100).join(BenchAccount.where(BenchPost.author == BenchAccount.id)),
+        "aggregate": lambda: BenchPost.select().key(BenchPost.author).aggregate(orm.CountColumn("*")).aggregate(orm.SumColumn(BenchPost.id).filter(BenchPost.id > 100)),
+        "paginate": lambda: BenchAccount.select().paginate(BenchAccount.id, page_size=50),
+        "insert": lambda: accounts[0].insert(),
+        "insert_many 100": lambda: BenchAccount.insert_many(accounts),
+        "update": lambda: BenchAccount.update().set(BenchAccount.score, 1.0).where(BenchAccount.id == 1),
+        "delete": lambda: BenchAccount.delete().where(BenchAccount.id == 1),
+        "batch update 100": lambda: orm.BatchUpdateQueryBuilder(BenchAccount, [BenchAccount.score], accounts),
+        "batch delete 100": lambda: orm.BatchDeleteQueryBuilder(BenchAccount, list(range(100))),
+        "upsert 100": lambda: BenchAccount.upsert(accounts).only_changed(),
+        "create": lambda: BenchAccount.create(),
+    }
+
+
+def bench_compile(results: Results) -> None:
+    for name, make in builders().items():
+        # warm is the steady state, the sql comes out of the compiled query cache
+        make().build()
+        results.add(f"build {name} (warm)", "us", measure(lambda: make().build(), 2000) * 1e6)
+
+        def cold() -> None:
+            query_cache.clear()
+            make().build()
+
+        results.add(f"build {name} (cold)", "us", measure(cold, 500) * 1e6)
+
+
+def bench_rows(results: Results) -> None:
+    row = BenchAccount(id=1, username="user", email="user@example.com", score=0.5, visits=3)
+
+    results.add("Table.__init__", "ns", measure(lambda: BenchAccount(id=1, username="user", email="user@example.com", score=0.5, visits=3), 100_000) * 1e9)
+    results.add("Column.__get__", "ns", measure(lambda: row.username, 1_000_000) * 1e9)
+    results.add("Column.__set__", "ns", measure(lambda: setattr(row, "score", 1.5), 1_000_000) * 1e9)
+
+
+def bench_hydration(results: Results, counts: list[int]) -> None:
+    for count in counts:
+        conn: Any = FakeConnection(records(count))
+
+        for mode, make in (
+            ("rows", lambda: BenchAccount.select()),
+            ("views", lambda: BenchAccount.select().views()),
+            ("raw", lambda: BenchAccount.select().raw()),
+            # the canned records stay full width, this only measures hydrating fewer columns
+            ("only", lambda: BenchAccount.select().only(BenchAccount.username)),
+        ):
+            elapsed = measure_async(lambda: make().fetch(conn))
+            results.add(f"fetch {mode} {count}", "rows/s", count / elapsed, seconds=elapsed)
+
+        conn = FakeConnection(join_records(count))
+        elapsed = measure_async(lambda: BenchPost.select().join(BenchAccount.where(BenchPost.author == BenchAccount.id)).fetch(conn))
+        results.add(f"fetch join {count}", "rows/s", count / elapsed, seconds=elapsed)
+
+
+async def bench_database(results: Results, dsn: str, count: int) -> None:
+    import asyncpg
+
+    conn = await asyncpg.connect(dsn)
+
+    try:
+        await conn.execute("drop table if exists bench_post, bench_account")
+        await conn.execute(BenchAccount.create().build()[0])
+
+        accounts = [BenchAccount(id=i, username=f"user {i}", email=f"user{i}@example.com", score=i / 7, visits=i) for i in range(count)]
+
+        start = time.perf_counter()
+        await BenchAccount.insert_many(accounts).execute(conn)
+        elapsed = time.perf_counter() - start
+        results.add(f"db insert_many {count}", "rows/s", count / elapsed, seconds=elapsed)
+
+        start = time.perf_counter()
+        await BenchAccount.upsert(accounts).execute(conn)
+        elapsed = time.perf_counter() - start
+        results.add(f"db upsert {count}", "rows/s", count / elapsed, seconds=elapsed)
+
+        lookups = min(count, 1000)
+        start = time.perf_counter()
+
+        for i in range(lookups):
+            await BenchAccount.where(BenchAccount.id == i).fetchone(conn)
+
+        results.add("db fetchone by primary key", "us", (time.perf_counter() - start) / lookups * 1e6)
+
+        start = time.perf_counter()
+        await BenchAccount.select().fetch(conn)
+        elapsed = time.perf_counter() - start
+        results.add(f"db fetch {count}", "rows/s", count / elapsed, seconds=elapsed)
+
+        start = time.perf_counter()
+        await BenchAccount.select().fetch_columns(conn)
+        elapsed = time.perf_counter() - start
+        results.add(f"db fetch_columns {count}", "rows/s", count / elapsed, seconds=elapsed)
+
+    finally:
+        await conn.execute("drop table if exists bench_post, bench_account")
+        await conn.close()
+
+
+def metadata() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+# higher is better for throughput, lower is better for everything else
+HIGHER_IS_BETTER = {"rows/s"}
+
+
+def compare(results: list[dict[str, Any]], path: str) -> None:
+    with open(path) as f:
+        baseline = {result["name"]: result for result in json.load(f)["results"]}
+
+    print(f"\ncompared to {path}")
+
+    for result in results:
+        if (before := baseline.get(result["name"])) is None or not before["value"]:
+            continue
+
+        change = (result["value"] - before["value"]) / before["value"] * 100
+
+        if result["unit"] not in HIGHER_IS_BETTER:
+            change = -change
+
+        print(f"{result['name']:<44} {change:>+8.1f}% {'faster' if change >= 0 else 'slower'}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", default="10000,1000000", help="row counts for the hydration benchmarks")
+    parser.add_argument("--only", choices=["compile", "rows", "hydration", "database"], action="append")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="results file from an earlier run to compare against")
+    args = parser.parse_args()
+
+    counts = [int(count) for count in args.rows.split(",")]
+    only = set(args.only or ["compile", "rows", "hydration", "database"])
+    results = Results()
+
+    if "compile" in only:
+        bench_compile(results)
+
+    if "rows" in only:
+        bench_rows(results)
+
+    if "hydration" in only:
+        bench_hydration(results, counts)
+
+    if "database" in only and (dsn := os.environ.get("ORM_BENCH_DSN")):
+        asyncio.run(bench_database(results, dsn, counts[0]))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"meta": metadata(), "results": results.results}, f, indent=2)
+
+    if args.compare:
+        compare(results.results, args.compare)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,3 +3,5 @@ from .datatypes import *
 from .query import *
 from .table import *
 from .where_query import *
+from .indexes import *
+from .session import *
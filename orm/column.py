@@ -5,22 +5,37 @@ from typing import TYPE_CHECKING, Any, Generic, TypeVar, get_args, overload
 
 from typing_extensions import Self
 
-from .where_query import WhereQuery
-from typing import Callable, Generic, TypeVar, get_args, overload, TYPE_CHECKING, Any
+import itertools
+
+from .where_query import Subquery, WhereQuery, _read_only
+from typing import Callable, Generic, Iterable, TypeVar, get_args, overload, TYPE_CHECKING, Any
 from typing_extensions import Self
 
-from .utils import T
+from .utils import T, Missing
 
 if TYPE_CHECKING:
     from .table import Table
 
-__all__ = ("Column", "ColumnBuilder", "primary", "foreign", "default")
+__all__ = ("Column", "ColumnBuilder", "primary", "foreign", "default", "index", "unique")
 
 T_P = TypeVar("T_P")
 
+_keys = itertools.count()
+
+
+def _single_column(query: Subquery) -> Subquery:
+    if (width := _read_only(query)._width()) is not None and width != 1:
+        # only() keeps the primary key, key() selects nothing but the column
+        raise Exception(
+            f"Subqueries compared with in_ or not_in must select one column, this one selects {width}, "
+            "use only() with just the primary key or key() for any other column"
+        )
+
+    return query
+
 
 class Column(Generic[T_P, T]):
-    def __init__(self, table: type[Table], name: str, datatype: T, db_datatype: str, default: Callable[[], T] | None, optional: bool, primary: bool, foreign: Column[Any, T] | None):
+    def __init__(self, table: type[Table], name: str, datatype: T, db_datatype: str, default: Callable[[], T] | None, optional: bool, primary: bool, foreign: Column[Any, T] | None, indexed: bool = False, unique: bool = False):
         self.table = table
         self.name = name
         self.datatype = datatype
@@ -29,9 +44,20 @@ class Column(Generic[T_P, T]):
         self.optional = optional
         self.primary = primary
         self.foreign = foreign
+        self.indexed = indexed
+        self.unique = unique
+        # position of the column in the table, rows store their values in this order
+        self.index = 0
+        self._full_name: str | None = None
+        # stands in for the column in cached query shapes, columns cant be hashed since == builds a where clause
+        self._key = next(_keys)
 
     def _to_full_name(self) -> str:
-        return f"\"{self.table._metadata.name}\".\"{self.name}\""
+        # the table metadata doesnt exist yet when columns are built so this cant be done in __init__
+        if self._full_name is None:
+            self._full_name = f"\"{self.table._metadata.name}\".\"{self.name}\""
+
+        return self._full_name
 
     @overload
     def __get__(self, instance: None, _: type[Table]) -> Self:
@@ -45,12 +71,27 @@ class Column(Generic[T_P, T]):
         if instance is None:
             return self
 
+        value = instance._values[self.index]
+
+        if value is Missing:
+            raise AttributeError(f"{self.table.__name__}.{self.name} has no value, it was never set or left out of the select by only()/defer()")
+
+        return value
+
+    def __set__(self, instance: Table, value: T) -> None:
+        instance._values[self.index] = value
+
+        # rows only get a dirty set once something is assigned, hydrated rows stay as small as possible
         try:
-            return instance._metadata.values[self.name]
-        except:
-            raise AttributeError
+            instance._dirty.add(self.index)
+        except AttributeError:
+            instance._dirty = {self.index}
 
     def __eq__(self, value: T | Self) -> WhereQuery:
+        # `= null` never matches anything, comparing against None is almost always meant as `is null`
+        if value is None:
+            return WhereQuery(self, None, "is null")
+
         return WhereQuery(self, value, "=")
 
     def __lt__(self, value: T | Self) -> WhereQuery:
@@ -59,9 +100,40 @@ class Column(Generic[T_P, T]):
     def __le__(self, value: T | Self) -> WhereQuery:
         return WhereQuery(self, value, "<=")
 
+    def __gt__(self, value: T | Self) -> WhereQuery:
+        return WhereQuery(self, value, ">")
+
+    def __ge__(self, value: T | Self) -> WhereQuery:
+        return WhereQuery(self, value, ">=")
+
     def __ne__(self, value: T | Self) -> WhereQuery:
+        if value is None:
+            return WhereQuery(self, None, "is not null")
+
         return WhereQuery(self, value, "!=")
 
+    # a subquery selecting a single column is compared in postgres instead of its results being sent back as a parameter
+    def in_(self, values: Iterable[T] | Subquery) -> WhereQuery:
+        if isinstance(values, Subquery):
+            return WhereQuery(self, _single_column(values), "in")
+
+        return WhereQuery(self, list(values), "= any")
+
+    def not_in(self, values: Iterable[T] | Subquery) -> WhereQuery:
+        if isinstance(values, Subquery):
+            return WhereQuery(self, _single_column(values), "not in")
+
+        return WhereQuery(self, list(values), "!= all")
+
+    def between(self, low: T | Self, high: T | Self) -> WhereQuery:
+        return WhereQuery(self, (low, high), "between")
+
+    def is_null(self) -> WhereQuery:
+        return WhereQuery(self, None, "is null")
+
+    def is_not_null(self) -> WhereQuery:
+        return WhereQuery(self, None, "is not null")
+
 class ColumnBuilder(Generic[T]):
     def __init__(self) -> None:
         self._name: str | None = None
@@ -71,6 +143,8 @@ class ColumnBuilder(Generic[T]):
         self._primary: bool = False
         self._foreign: Column[Any, Any] | None = None
         self._table: type[Table] | None = None
+        self._indexed: bool = False
+        self._unique: bool = False
 
     def name(self, name: str) -> Self:
         self._name = name
@@ -92,6 +166,14 @@ class ColumnBuilder(Generic[T]):
         self._foreign = column
         return self
 
+    def index(self) -> Self:
+        self._indexed = True
+        return self
+
+    def unique(self) -> Self:
+        self._unique = True
+        return self
+
     def table(self, table: type[Table]) -> Self:
         self._table = table
         return self
@@ -109,7 +191,7 @@ class ColumnBuilder(Generic[T]):
         if self._foreign and self._type != self._foreign.datatype:
             raise Exception(f"{self._table.__name__}.{self._name} does not match the foreign key type of {self._foreign.datatype.__name__}")
 
-        return Column[Any, T](self._table, self._name, self._type, self._db_type, self._default, NoneType in get_args(self._type), self._primary, self._foreign)
+        return Column[Any, T](self._table, self._name, self._type, self._db_type, self._default, NoneType in get_args(self._type), self._primary, self._foreign, self._indexed, self._unique)
 
 
 def primary() -> ColumnBuilder[Any]:
@@ -122,3 +204,11 @@ def foreign(column: Column[Any, T]) -> ColumnBuilder[T]:
 
 def default(default: Callable[[], T]) -> ColumnBuilder[T]:
     return ColumnBuilder[T]().default(default)
+
+
+def index() -> ColumnBuilder[Any]:
+    return ColumnBuilder[Any]().index()
+
+
+def unique() -> ColumnBuilder[Any]:
+    return ColumnBuilder[Any]().unique()
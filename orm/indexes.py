@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import TYPE_CHECKING, Any, Sequence
+
+from .column import Column
+from .query.compiler import LiteralCompiler, compile_where
+
+if TYPE_CHECKING:
+    from .table import Table
+    from .where_query import WhereQuery
+
+__all__ = ("Index",)
+
+# postgres truncates identifiers past this
+MAX_NAME = 63
+
+
+class Index:
+    # columns, or strings holding a sql expression, e.g. Index('lower("email")', unique=True)
+    def __init__(
+        self,
+        *keys: Column[Any, Any] | str,
+        name: str | None = None,
+        unique: bool = False,
+        where: WhereQuery | None = None,
+        include: Sequence[Column[Any, Any]] = (),
+        using: str | None = None,
+    ) -> None:
+        if not keys:
+            raise Exception("An index needs at least one column or expression")
+
+        self.keys = keys
+        self._name = name
+        self.unique = unique
+        self.where = where
+        self.include = list(include)
+        self.using = using
+
+    @property
+    def columns(self) -> list[Column[Any, Any]]:
+        return [key for key in self.keys if isinstance(key, Column)]
+
+    def key_sql(self) -> list[str]:
+        return [f"\"{key.name}\"" if isinstance(key, Column) else f"({key})" for key in self.keys]
+
+    def where_sql(self) -> str | None:
+        if self.where is None:
+            return None
+
+        # create index cant take bind parameters, values are written into the predicate
+        return compile_where(self.where, LiteralCompiler())
+
+    def name(self, table: type[Table]) -> str:
+        if self._name is not None:
+            return self._name
+
+        parts = [key.name if isinstance(key, Column) else re.sub(r"\W+", "_", key).strip("_") for key in self.keys]
+        name = f"{table._metadata.name}_{'_'.join(parts)}_{'key' if self.unique else 'idx'}"
+
+        if len(name) > MAX_NAME or self.where is not None:
+            # keeps indexes that only differ in their predicate, or share a long prefix, from colliding
+            digest = hashlib.sha1(f"{self.key_sql()}{self.where_sql()}".encode()).hexdigest()[:8]
+            name = f"{name[:MAX_NAME - 9]}_{digest}"
+
+        return name
+
+    def __repr__(self) -> str:
+        keys = ", ".join(f"{key.table.__name__}.{key.name}" if isinstance(key, Column) else repr(key) for key in self.keys)
+        return f"<Index {keys} unique={self.unique} partial={self.where is not None}>"
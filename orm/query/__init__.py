@@ -1,12 +1,63 @@
 from .base import QueryBuilder as QueryBuilder
-from .create import CreateTableQueryBuilder as CreateTableQueryBuilder
+from .create import CreateTableQueryBuilder as CreateTableQueryBuilder, CreateIndexQueryBuilder as CreateIndexQueryBuilder
 from .insert import InsertQueryBuilder as InsertQueryBuilder
+from .bulk_insert import BulkInsertQueryBuilder as BulkInsertQueryBuilder
+from .copy import CopyFromQueryBuilder as CopyFromQueryBuilder
 from .select import TupleSelectQueryBuilder as TupleSelectQueryBuilder
 from .select import SelectQueryBuilder as SelectQueryBuilder
+from .select import AggregateQueryBuilder as AggregateQueryBuilder
+from .cte import CommonTableExpression as CommonTableExpression, cte as cte
+from .paginate import Page as Page, PageQueryBuilder as PageQueryBuilder
 from .update import UpdateQueryBuilder as UpdateQueryBuilder
+from .upsert import UpsertQueryBuilder as UpsertQueryBuilder
 from .delete import DeleteQueryBuilder as DeleteQueryBuilder
+from .batch import (
+    BatchUpdateQueryBuilder as BatchUpdateQueryBuilder,
+    BatchDeleteQueryBuilder as BatchDeleteQueryBuilder
+)
 from .column import (
     ColumnQueryBuilder as ColumnQueryBuilder,
     MaxColumn as MaxColumn,
-    CountColumn as CountColumn
+    MinColumn as MinColumn,
+    SumColumn as SumColumn,
+    AvgColumn as AvgColumn,
+    CountColumn as CountColumn,
+    CountDistinctColumn as CountDistinctColumn,
+    ArrayAggColumn as ArrayAggColumn
+)
+from .compiler import (
+    Compiler as Compiler,
+    CompiledQuery as CompiledQuery,
+    QueryCache as QueryCache,
+    QueryCacheInfo as QueryCacheInfo,
+    query_cache as query_cache
+)
+from .prepared import (
+    PreparedStatements as PreparedStatements,
+    StatementStats as StatementStats,
+    prepared_statements as prepared_statements
+)
+from .result_cache import (
+    ResultCache as ResultCache,
+    ResultCacheInfo as ResultCacheInfo,
+    result_cache as result_cache,
+    invalidate_tables as invalidate_tables
+)
+from .notify import (
+    InvalidationNotifier as InvalidationNotifier,
+    InvalidationListener as InvalidationListener,
+    notifier as notifier
+)
+from .router import PoolStats as PoolStats, Router as Router
+from .instrument import (
+    QueryEvent as QueryEvent,
+    QueryHook as QueryHook,
+    Instrumentation as Instrumentation,
+    instrumentation as instrumentation,
+    FingerprintStats as FingerprintStats,
+    QueryStats as QueryStats,
+    fingerprint as fingerprint
 )
+from .advisor import IndexAdvisor as IndexAdvisor, IndexSuggestion as IndexSuggestion
+from .columnar import Columns as Columns
+from .loader import Loader as Loader, LoaderStats as LoaderStats
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any, cast
+
+from ..column import Column
+from ..indexes import Index
+from ..where_query import WhereGroup
+from .create import CreateIndexQueryBuilder
+from .delete import DeleteQueryBuilder
+from .router import acquire
+from .select import SelectQueryBuilder, TupleSelectQueryBuilder
+from .update import UpdateQueryBuilder
+
+if TYPE_CHECKING:
+    from ..table import Table
+    from ..utils import Executor
+    from ..where_query import WhereQuery
+    from .instrument import QueryEvent
+
+__all__ = ("IndexSuggestion", "IndexAdvisor")
+
+# conditions an index lookup can use, anything else (!=, is not null, ...) reads most of the table anyway
+EQUALITY_OPS = {"=", "= any", "in", "is null"}
+RANGE_OPS = {"<", "<=", ">", ">=", "between"}
+
+INDEXES_QUERY = "select tablename, indexname, indexdef from pg_indexes where schemaname = current_schema() and tablename = any($1)"
+STATS_QUERY = (
+    "select relname, seq_scan, coalesce(idx_scan, 0), n_live_tup from pg_stat_user_tables "
+    "where schemaname = current_schema() and relname = any($1)"
+)
+
+_IDENTIFIER = re.compile(r'^"?([^"\s(]+)"?(?:\s|$)')
+
+
+def _index_columns(indexdef: str) -> list[str]:
+    # CREATE [UNIQUE] INDEX name ON table USING method (a, "b" DESC, lower(c)) INCLUDE (d) WHERE ...
+    start = indexdef.find("(", indexdef.find(" USING "))
+    depth = 0
+    parts: list[str] = []
+    current = ""
+
+    for char in indexdef[start + 1:]:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            if depth == 0:
+                break
+
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+            continue
+
+        current += char
+
+    parts.append(current.strip())
+
+    # expressions cant help a plain column lookup, they only keep their position
+    return [match.group(1) if (match := _IDENTIFIER.match(part)) and "(" not in part else "" for part in parts]
+
+
+class _Shape:
+    __slots__ = ("equality", "range", "order")
+
+    def __init__(self) -> None:
+        self.equality: list[Column[Any, Any]] = []
+        self.range: list[Column[Any, Any]] = []
+        self.order: list[Column[Any, Any]] = []
+
+    def add(self, columns: list[Column[Any, Any]], column: Column[Any, Any]) -> None:
+        if not any(column is existing for existing in columns):
+            columns.append(column)
+
+    def candidate(self, table: type[Table]) -> tuple[tuple[Column[Any, Any], ...], int]:
+        # equality columns lead in any order, then whatever decides the order of the rows, or else the first range
+        columns = sorted([column for column in self.equality if column.table is table], key=lambda column: column.index)
+        equality = len(columns)
+        order = [column for column in self.order if column.table is table]
+
+        if order and len(order) == len(self.order):
+            for column in order:
+                self.add(columns, column)
+        elif ranges := [column for column in self.range if column.table is table]:
+            self.add(columns, ranges[0])
+
+        return tuple(columns), equality
+
+
+def _branches(wheres: list[tuple[str, WhereQuery]]) -> list[list[WhereQuery]]:
+    # and binds tighter than or, so every top level or starts a branch that needs its own index
+    branches: list[list[WhereQuery]] = [[]]
+
+    for i, (joiner, where) in enumerate(wheres):
+        if i and joiner.lower() == "or":
+            branches.append([])
+
+        branches[-1].append(where)
+
+    return branches
+
+
+def _collect(where: WhereQuery, shape: _Shape, shapes: list[_Shape], table: type[Table]) -> None:
+    if isinstance(where, WhereGroup):
+        if where.joiner == "and":
+            for child in where.children:
+                _collect(child, shape, shapes, table)
+        elif where.joiner == "or":
+            # a bitmap or can combine one index per branch
+            for child in where.children:
+                branch = _Shape()
+                _collect(child, branch, shapes, table)
+                shapes.append(branch)
+
+        return
+
+    column = where.column
+    value: Any = where.value
+
+    if isinstance(value, Column):
+        # join conditions look up rows of the table being joined
+        other = cast("Column[Any, Any]", value)
+
+        if column.table is other.table:
+            return
+
+        column = column if column.table is table else other
+
+        if column.table is not table or where.op != "=":
+            return
+
+    if where.op in EQUALITY_OPS:
+        shape.add(shape.equality, column)
+    elif where.op in RANGE_OPS:
+        shape.add(shape.range, column)
+
+
+def _shapes(wheres: list[tuple[str, WhereQuery]], table: type[Table], order: list[Column[Any, Any]]) -> list[_Shape]:
+    shapes: list[_Shape] = []
+
+    for branch in _branches(wheres):
+        shape = _Shape()
+
+        for where in branch:
+            _collect(where, shape, shapes, table)
+
+        shape.order = order
+        shapes.append(shape)
+
+    return shapes
+
+
+Candidate = tuple[type["Table"], tuple[Column[Any, Any], ...], int]
+
+
+def candidates(builder: Any) -> list[Candidate]:
+    found: list[Candidate] = []
+
+    if isinstance(builder, (SelectQueryBuilder, UpdateQueryBuilder, DeleteQueryBuilder)):
+        query = cast("SelectQueryBuilder[Any] | UpdateQueryBuilder[Any] | DeleteQueryBuilder[Any]", builder)
+        order = [column for column, _ in getattr(query, "_order", [])] or list(getattr(query, "_groups", []))
+
+        for shape in _shapes(query._wheres, query.table, order):
+            found.append((query.table, *shape.candidate(query.table)))
+
+    if isinstance(builder, TupleSelectQueryBuilder):
+        for extra in builder._extras:
+            if isinstance(extra, SelectQueryBuilder):
+                for shape in _shapes(extra._wheres, extra.table, []):
+                    found.append((extra.table, *shape.candidate(extra.table)))
+
+    return [candidate for candidate in found if candidate[1]]
+
+
+def _matched(indexed: list[str], wanted: list[str], equality: int) -> int:
+    # how many of the wanted columns an index leads with, the equality ones can come in any order
+    remaining = wanted[:equality]
+    matched = 0
+
+    for name in indexed:
+        if remaining:
+            if name not in remaining:
+                break
+
+            remaining.remove(name)
+        elif matched >= len(wanted) or name != wanted[matched]:
+            break
+
+        matched += 1
+
+    return matched
+
+
+class IndexSuggestion:
+    def __init__(self, table: type[Table], columns: tuple[Column[Any, Any], ...], existing: str | None) -> None:
+        self.table = table
+        self.columns = columns
+        # the index that already covers a prefix of the columns, if any
+        self.existing = existing
+        self.count = 0
+        self.db_time = 0.0
+        self.queries: list[str] = []
+        self.seq_scan_ratio: float | None = None
+        self.live_rows: int | None = None
+
+    @property
+    def index(self) -> Index:
+        return Index(*self.columns)
+
+    @property
+    def sql(self) -> str:
+        return CreateIndexQueryBuilder(self.table, self.index, concurrently=True, if_not_exists=True).build()[0]
+
+    @property
+    def score(self) -> float:
+        # time spent in the queries that would use it, weighted up when the table is mostly read sequentially
+        # and down when an existing index already gets part of the way there
+        score = self.db_time or self.count * 1e-3
+
+        if self.seq_scan_ratio is not None:
+            score *= 1 + self.seq_scan_ratio
+
+        return score / 2 if self.existing else score
+
+    def __repr__(self) -> str:
+        columns = ", ".join(column.name for column in self.columns)
+        return f"<IndexSuggestion {self.table.__name__}({columns}) score={self.score:.4f} queries={self.count} existing={self.existing!r}>"
+
+
+class _Seen:
+    __slots__ = ("table", "columns", "equality", "count", "db_time", "queries")
+
+    def __init__(self, table: type[Table], columns: tuple[Column[Any, Any], ...], equality: int) -> None:
+        self.table = table
+        self.columns = columns
+        self.equality = equality
+        self.count = 0
+        self.db_time = 0.0
+        self.queries: list[str] = []
+
+
+class IndexAdvisor:
+    # add to orm.instrumentation, it records the column sets of every select, update and delete that runs
+    def __init__(self, *, min_rows: int = 1000, max_queries: int = 5) -> None:
+        self.min_rows = min_rows
+        self.max_queries = max_queries
+        # keyed by column names, columns turn == into a where clause so they cant be hashed
+        self._seen: dict[tuple[type[Table], tuple[str, ...]], _Seen] = {}
+        self._shapes: dict[str, list[Candidate]] = {}
+
+    def before(self, event: QueryEvent) -> None:
+        pass
+
+    def after(self, event: QueryEvent) -> None:
+        if event.error is not None:
+            return
+
+        # the same fingerprint always has the same shape, only the first run of each gets inspected
+        if (shapes := self._shapes.get(event.fingerprint)) is None:
+            shapes = self._shapes[event.fingerprint] = candidates(event.source)
+
+        for table, columns, equality in shapes:
+            key = (table, tuple(column.name for column in columns))
+
+            if (seen := self._seen.get(key)) is None:
+                seen = self._seen[key] = _Seen(table, columns, equality)
+
+            seen.count += 1
+            seen.db_time += event.db_time
+
+            if len(seen.queries) < self.max_queries and event.fingerprint not in seen.queries:
+                seen.queries.append(event.fingerprint)
+
+    def reset(self) -> None:
+        self._seen.clear()
+        self._shapes.clear()
+
+    def _declared(self, table: type[Table]) -> list[tuple[str, list[str]]]:
+        declared = [(f"{table._metadata.name}_pkey", [column.name for column in table._metadata.primary])]
+
+        for index in table._metadata.indexes:
+            declared.append((index.name(table), [key.name if isinstance(key, Column) else "" for key in index.keys]))
+
+        return declared
+
+    # ranked suggestions for the column sets no declared or (with a connection) live index serves
+    async def report(self, conn: Executor | None = None) -> list[IndexSuggestion]:
+        tables = {seen.table for seen in self._seen.values()}
+        live: dict[str, list[tuple[str, list[str]]]] = {}
+        stats: dict[str, tuple[int, int, int]] = {}
+
+        if conn is not None and tables:
+            names = [table._metadata.name for table in tables]
+
+            async with acquire(conn, False) as conn:
+                for name, index, indexdef in await conn.fetch(INDEXES_QUERY, names):
+                    live.setdefault(name, []).append((index, _index_columns(indexdef)))
+
+                for name, seq_scan, idx_scan, live_rows in await conn.fetch(STATS_QUERY, names):
+                    stats[name] = (seq_scan, idx_scan, live_rows)
+
+        suggestions: list[IndexSuggestion] = []
+
+        for seen in self._seen.values():
+            name = seen.table._metadata.name
+            wanted = [column.name for column in seen.columns]
+            best, matched = None, 0
+
+            for index, indexed in [*self._declared(seen.table), *live.get(name, [])]:
+                if (prefix := _matched(indexed, wanted, seen.equality)) > matched:
+                    best, matched = index, prefix
+
+            if matched >= len(wanted):
+                continue
+
+            suggestion = IndexSuggestion(seen.table, seen.columns, best)
+            suggestion.count = seen.count
+            suggestion.db_time = seen.db_time
+            suggestion.queries = list(seen.queries)
+
+            if (table_stats := stats.get(name)) is not None:
+                seq_scan, idx_scan, live_rows = table_stats
+                suggestion.seq_scan_ratio = seq_scan / (seq_scan + idx_scan) if seq_scan + idx_scan else 0.0
+                suggestion.live_rows = live_rows
+
+                # sequential scans are the right plan for small tables
+                if live_rows < self.min_rows:
+                    continue
+
+            suggestions.append(suggestion)
+
+        suggestions.sort(key=lambda suggestion: suggestion.score, reverse=True)
+
+        return suggestions
@@ -1,41 +1,200 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Generic
+from contextlib import AbstractAsyncContextManager, nullcontext
+from typing import TYPE_CHECKING, Any, Callable, Generic, Hashable, Literal
 
+from ..column import Column
 from ..utils import T_T
+from ..where_query import Subquery, WhereGroup
+from .compiler import CompiledQuery, Compiler, query_cache
+from .hydrate import hydrator, identity, view
+from .instrument import instrumentation
+from .prepared import prepared_statements
+from .notify import notifier
+from .result_cache import invalidate_tables
+from .router import acquire
 
 if TYPE_CHECKING:
-    from ..utils import Connection
+    from asyncpg import Record
+    from asyncpg.cursor import CursorFactory
 
+    from ..utils import Connection, Executor
+    from ..where_query import WhereQuery
+
+
+def _primary_keys(where: WhereQuery, primary: Column[Any, Any], keys: list[Any]) -> bool:
+    # only equality with the primary key, or any of these or'd together, pins down the rows up front
+    if isinstance(where, WhereGroup):
+        return where.joiner == "or" and all(_primary_keys(child, primary, keys) for child in where.children)
+
+    if where.column is not primary or isinstance(where.value, Column):
+        return False
+
+    if where.op == "=":
+        keys.append(where.value)
+    elif where.op == "= any":
+        keys.extend(where.value)
+    else:
+        return False
+
+    return True
+
+
+class QueryBuilder(Subquery, Generic[T_T]):
+    _hydration: Literal["rows", "views", "raw"] = "rows"
+    # write builders set this so cached results read from their table get dropped
+    _writes: bool = False
 
-class QueryBuilder(Generic[T_T]):
     def __init__(self, table: type[T_T]) -> None:
         self.table = table
 
-    def build(self) -> tuple[str, list[Any]]:
+    # appends the parameter values in placeholder order and returns everything
+    # else that affects the sql text, this is what the compiled query is cached by
+    def _bind(self, parameters: list[Any]) -> Hashable:
         raise NotImplementedError
 
-    async def execute(self, conn: Connection) -> int:
-        query, parameters = self.build()
+    def _compile(self, compiler: Compiler) -> str:
+        raise NotImplementedError
+
+    def compile(self) -> tuple[CompiledQuery, list[Any]]:
+        parameters: list[Any] = []
+        key = self._bind(parameters)
+
+        return query_cache.get(key, self), parameters
+
+    def build(self) -> tuple[str, list[Any]]:
+        compiled, parameters = self.compile()
+
+        return compiled.query, parameters
+
+    def _tables(self) -> set[str]:
+        return {self.table._metadata.name}
+
+    async def _written(self, conn: Connection, records: list[Record] | None = None) -> None:
+        if not self._writes:
+            return
+
+        invalidate_tables(self.table._metadata.name)
+
+        if notifier.tracking(conn):
+            await notifier.notify(conn, self.table._metadata.name, self._written_keys(records))
+
+    # primary keys of the rows a write touched, None when they cant be known up front
+    def _written_keys(self, records: list[Record] | None) -> list[Any] | None:
+        primary = self.table._metadata.primary
+
+        if len(primary) != 1:
+            return None
+
+        if records is not None:
+            # write builders return the tables columns in metadata order
+            return [record[primary[0].index] for record in records]
+
+        keys: list[Any] = []
+
+        for i, (joiner, where) in enumerate(getattr(self, "_wheres", [])):
+            if (i and joiner.lower() != "or") or not _primary_keys(where, primary[0], keys):
+                return None
+
+        return keys or None
+
+    async def _execute(self, conn: Connection, query: str, parameters: list[Any]) -> str:
+        if prepared_statements.enabled:
+            stmt = await prepared_statements.prepare(conn, query)
+            await stmt.fetch(*parameters)
+            # only None before the statement has run
+            status = stmt.get_statusmsg() or ""
+        else:
+            status = await conn.execute(query, *parameters)
+
+        await self._written(conn)
+        return status
+
+    async def _fetch(self, conn: Connection, query: str, parameters: list[Any]) -> list[Record]:
+        if prepared_statements.enabled:
+            stmt = await prepared_statements.prepare(conn, query)
+            records = await stmt.fetch(*parameters)
+        else:
+            records = await conn.fetch(query, *parameters)
+
+        await self._written(conn, records)
+        return records
+
+    async def _fetchrow(self, conn: Connection, query: str, parameters: list[Any]) -> Record | None:
+        if prepared_statements.enabled:
+            stmt = await prepared_statements.prepare(conn, query)
+            record = await stmt.fetchrow(*parameters)
+        else:
+            record = await conn.fetchrow(query, *parameters)
+
+        await self._written(conn, None if record is None else [record])
+        return record
+
+    async def _cursor(self, conn: Connection, query: str, parameters: list[Any], prefetch: int | None = None) -> CursorFactory[Record]:
+        if prepared_statements.enabled:
+            stmt = await prepared_statements.prepare(conn, query)
+            return stmt.cursor(*parameters, prefetch=prefetch)
+
+        return conn.cursor(query, *parameters, prefetch=prefetch)
+
+    def _transaction(self, conn: Connection) -> AbstractAsyncContextManager[Any]:
+        # cursors only live inside a transaction, reuse the callers one if there is one
+        if conn.is_in_transaction():
+            return nullcontext()
+
+        return conn.transaction()
+
+    def _hydrator(self) -> Callable[[Record], Any]:
+        if self._hydration == "raw":
+            return identity
+
+        if self._hydration == "views":
+            return view(self.table)
+
+        return hydrator(self.table)
+
+    async def execute(self, conn: Executor) -> int:
+        with instrumentation.start(self, "execute") as event:
+            query, parameters = self.build()
+            event.built(query)
+
+            async with acquire(conn, self._writes) as conn:
+                res = await self._execute(conn, query, parameters)
+
+            try:
+                count = int(res.split(" ")[-1])
+            except ValueError:  # didnt give an amount - default to zero
+                count = 0
+
+            event.fetched(count)
+
+        return count
+
+    async def fetch(self, conn: Executor) -> list[T_T]:
+        with instrumentation.start(self, "fetch") as event:
+            query, parameters = self.build()
+            event.built(query)
+
+            async with acquire(conn, self._writes) as conn:
+                records = await self._fetch(conn, query, parameters)
 
-        res = await conn.execute(query, *parameters)
+            event.fetched(len(records))
 
-        try:
-            return int(res.split(" ")[-1])
-        except ValueError:  # didnt give an amount - default to zero
-            return 0
+            hydrate = self._hydrator()
+            rows = [hydrate(record) for record in records]
 
-    async def fetch(self, conn: Connection) -> list[T_T]:
-        query, parameters = self.build()
+        return rows
 
-        records = await conn.fetch(query, *parameters)
+    async def fetchone(self, conn: Executor) -> T_T | None:
+        with instrumentation.start(self, "fetchone") as event:
+            query, parameters = self.build()
+            event.built(query)
 
-        return [self.table(**record) for record in records]
+            async with acquire(conn, self._writes) as conn:
+                record = await self._fetchrow(conn, query, parameters)
 
-    async def fetchone(self, conn: Connection) -> T_T | None:
-        query, parameters = self.build()
+            event.fetched(0 if record is None else 1)
 
-        record = await conn.fetchrow(query, *parameters)
+            row = None if record is None else self._hydrator()(record)
 
-        if record:
-            return self.table(**record)
+        return row
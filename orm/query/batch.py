@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Hashable
+
+from ..utils import T_T
+from .base import QueryBuilder
+from .compiler import Compiler, bind_arrays, compile_arrays
+
+if TYPE_CHECKING:
+    from asyncpg import Record
+
+    from ..column import Column
+
+
+class BatchUpdateQueryBuilder(QueryBuilder[T_T]):
+    _writes = True
+
+    def __init__(self, table: type[T_T], columns: list[Column[Any, Any]], rows: list[T_T]) -> None:
+        super().__init__(table)
+        self.columns = columns
+        self.rows = rows
+
+    def _bind(self, parameters: list[Any]) -> Hashable:
+        primary = self.table._metadata.primary_key
+
+        bind_arrays([row._values for row in self.rows], [column.index for column in [primary, *self.columns]], parameters)
+
+        return (BatchUpdateQueryBuilder, self.table, tuple(column.name for column in self.columns))
+
+    def _written_keys(self, records: list[Record] | None) -> list[Any] | None:
+        primary = self.table._metadata.primary_key
+
+        return [row._values[primary.index] for row in self.rows]
+
+    def _compile(self, compiler: Compiler) -> str:
+        primary = self.table._metadata.primary_key
+        columns = [primary, *self.columns]
+
+        arrays = compile_arrays(columns, compiler)
+        names = ", ".join([f"\"{column.name}\"" for column in columns])
+        sets = ", ".join([f"\"{column.name}\" = \"values\".\"{column.name}\"" for column in self.columns])
+
+        return (
+            f"update \"{self.table._metadata.name}\" set {sets} "
+            f"from unnest({arrays}) as \"values\"({names}) "
+            f"where {primary._to_full_name()} = \"values\".\"{primary.name}\""
+        )
+
+
+class BatchDeleteQueryBuilder(QueryBuilder[T_T]):
+    _writes = True
+
+    def __init__(self, table: type[T_T], keys: list[Any]) -> None:
+        super().__init__(table)
+        self.keys = keys
+
+    def _bind(self, parameters: list[Any]) -> Hashable:
+        parameters.append(self.keys)
+
+        return (BatchDeleteQueryBuilder, self.table)
+
+    def _written_keys(self, records: list[Record] | None) -> list[Any] | None:
+        return self.keys
+
+    def _compile(self, compiler: Compiler) -> str:
+        primary = self.table._metadata.primary_key
+
+        return f"delete from \"{self.table._metadata.name}\" where {primary._to_full_name()} = any({compiler.param()}::{primary.db_datatype}[])"
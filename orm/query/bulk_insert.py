@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, AsyncIterable, AsyncIterator, Collection, Hashable, Iterable
+
+from ..utils import T_T
+from .base import QueryBuilder
+from .compiler import Compiler, query_cache
+from .instrument import instrumentation
+from .router import acquire
+from .insert import column_value
+
+if TYPE_CHECKING:
+    from ..table import Table
+    from ..utils import Executor
+
+# postgres caps a single statement at 32767 bind parameters
+MAX_PARAMETERS = 32767
+
+
+class BulkInsertQueryBuilder(QueryBuilder[T_T]):
+    _writes = True
+
+    def __init__(self, table: type[T_T], rows: Iterable[T_T] | AsyncIterable[T_T], chunk_size: int = 10_000) -> None:
+        super().__init__(table)
+        self.rows = rows
+        self.chunk_size = chunk_size
+        self._row_count = 0
+
+    def _record(self, row: Table) -> tuple[Any, ...]:
+        return tuple(column_value(self.table, row, column) for column in self.table._metadata.columns)
+
+    async def _chunks(self, size: int) -> AsyncIterator[list[tuple[Any, ...]]]:
+        chunk: list[tuple[Any, ...]] = []
+
+        if isinstance(self.rows, AsyncIterable):
+            async for row in self.rows:
+                chunk.append(self._record(row))
+
+                if len(chunk) >= size:
+                    yield chunk
+                    chunk = []
+        else:
+            for row in self.rows:
+                chunk.append(self._record(row))
+
+                if len(chunk) >= size:
+                    yield chunk
+                    chunk = []
+
+        if chunk:
+            yield chunk
+
+    def _bind(self, parameters: list[Any]) -> Hashable:
+        if isinstance(self.rows, AsyncIterable):
+            raise Exception("Cannot build a single insert from an async iterable, use fetch or execute")
+
+        if not isinstance(self.rows, Collection):
+            # a generator would come up empty when execute or fetch reads it again after a build
+            self.rows = list(self.rows)
+
+        records = [self._record(row) for row in self.rows]
+
+        for record in records:
+            parameters.extend(record)
+
+        self._row_count = len(records)
+
+        return (BulkInsertQueryBuilder, self.table, self._row_count)
+
+    def _compile(self, compiler: Compiler) -> str:
+        columns = ",".join([f"\"{column.name}\"" for column in self.table._metadata.columns])
+        rows: list[str] = []
+
+        for _ in range(self._row_count):
+            rows.append(f"({','.join([compiler.param() for _ in self.table._metadata.columns])})")
+
+        return f"insert into \"{self.table._metadata.name}\"({columns}) values {','.join(rows)} returning {columns}"
+
+    async def execute(self, conn: Executor) -> int:
+        columns = [column.name for column in self.table._metadata.columns]
+        count = 0
+
+        with instrumentation.start(self, "copy") as event:
+            # what asyncpg sends for copy_records_to_table
+            names = ",".join([f"\"{name}\"" for name in columns])
+            event.built(f"copy \"{self.table._metadata.name}\"({names}) from stdin (format binary)")
+
+            async with acquire(conn, True) as conn, conn.transaction():
+                async for records in self._chunks(self.chunk_size):
+                    await conn.copy_records_to_table(self.table._metadata.name, records=records, columns=columns)
+                    count += len(records)
+
+                await self._written(conn)
+
+            event.fetched(count)
+
+        return count
+
+    async def fetch(self, conn: Executor) -> list[T_T]:
+        size = min(self.chunk_size, MAX_PARAMETERS // len(self.table._metadata.columns))
+        rows: list[T_T] = []
+        hydrate = self._hydrator()
+
+        with instrumentation.start(self, "fetch") as event:
+            async with acquire(conn, True) as conn, conn.transaction():
+                async for records in self._chunks(size):
+                    parameters = [value for record in records for value in record]
+                    self._row_count = len(records)
+
+                    compiled = query_cache.get((BulkInsertQueryBuilder, self.table, self._row_count), self)
+
+                    if not rows:
+                        event.built(compiled.query)
+
+                    rows.extend(map(hydrate, await self._fetch(conn, compiled.query, parameters)))
+
+            # hydration happens chunk by chunk and is counted as database time
+            event.fetched(len(rows))
+
+        return rows
@@ -1,30 +1,98 @@
 from __future__ import annotations
 
-from typing import Any, Generic, Literal
+from decimal import Decimal
+from typing import Any, Generic, Hashable, Literal
 
-from orm.column import Column
+from typing_extensions import Self
 
 from ..column import Column
 from ..utils import T
+from ..where_query import WhereQuery
+from .compiler import Compiler, bind_where, compile_where
 
 
 class ColumnQueryBuilder(Generic[T]):
     def __init__(self, col: Column[Any, Any]):
         self.col = col
+        self._filter: WhereQuery | None = None
 
-    def build(self) -> tuple[str, list[Any]]:
+    # aggregate only the rows matching the condition, `agg(...) filter (where ...)`
+    def filter(self, where: WhereQuery) -> Self:
+        self._filter = where if self._filter is None else self._filter & where
+        return self
+
+    def _expression(self) -> str:
         raise NotImplementedError
 
+    def _bind(self, parameters: list[Any]) -> Hashable:
+        return (type(self), self._expression(), None if self._filter is None else bind_where(self._filter, parameters))
+
+    def _compile(self, compiler: Compiler) -> str:
+        if self._filter is None:
+            return self._expression()
+
+        return f"{self._expression()} filter (where {compile_where(self._filter, compiler)})"
+
+    def build(self) -> tuple[str, list[Any]]:
+        parameters: list[Any] = []
+        self._bind(parameters)
+
+        return self._compile(Compiler()), parameters
+
 class MaxColumn(ColumnQueryBuilder[T]):
     def __init__(self, col: Column[Any, T]):
         super().__init__(col)
 
-    def build(self) -> tuple[str, list[Any]]:
-        return f"max({self.col._to_full_name()})", []
+    def _expression(self) -> str:
+        return f"max({self.col._to_full_name()})"
+
+class MinColumn(ColumnQueryBuilder[T]):
+    def __init__(self, col: Column[Any, T]):
+        super().__init__(col)
+
+    def _expression(self) -> str:
+        return f"min({self.col._to_full_name()})"
+
+# postgres widens the sum, int and smallint come back as an int (bigint) and bigint as a Decimal (numeric)
+class SumColumn(ColumnQueryBuilder[T | Decimal]):
+    def __init__(self, col: Column[Any, T]):
+        super().__init__(col)
+
+    def _expression(self) -> str:
+        return f"sum({self.col._to_full_name()})"
+
+# a float for real and double columns, a Decimal for integer and numeric ones
+class AvgColumn(ColumnQueryBuilder[Decimal | float]):
+    def __init__(self, col: Column[Any, Any]):
+        super().__init__(col)
+
+    def _expression(self) -> str:
+        return f"avg({self.col._to_full_name()})"
 
 class CountColumn(ColumnQueryBuilder[int]):
     def __init__(self, col: Column[Any, Any] | Literal["*"]):
         self.col_name = col._to_full_name() if not isinstance(col, str) else col
+        self._filter = None
 
-    def build(self) -> tuple[str, list[Any]]:
-        return f"count({self.col_name})", []
+    def _expression(self) -> str:
+        return f"count({self.col_name})"
+
+class CountDistinctColumn(ColumnQueryBuilder[int]):
+    def __init__(self, col: Column[Any, Any]):
+        super().__init__(col)
+
+    def _expression(self) -> str:
+        return f"count(distinct {self.col._to_full_name()})"
+
+# the values of every row in the group as a list, in the given order or else whatever order postgres reads them
+class ArrayAggColumn(ColumnQueryBuilder[list[T]]):
+    def __init__(self, col: Column[Any, T], *, order_by: Column[Any, Any] | None = None, descending: bool = False):
+        super().__init__(col)
+        self.order_by = order_by
+        self.descending = descending
+
+    def _expression(self) -> str:
+        if self.order_by is None:
+            return f"array_agg({self.col._to_full_name()})"
+
+        return f"array_agg({self.col._to_full_name()} order by {self.order_by._to_full_name()} {'desc' if self.descending else 'asc'})"
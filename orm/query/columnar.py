@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import array
+from typing import TYPE_CHECKING, Any
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if TYPE_CHECKING:
+    from asyncpg import Record
+
+    from ..column import Column
+
+__all__ = ("Columns",)
+
+# array.array typecode and numpy dtype for every column type that has a fixed width representation,
+# anything else is kept as python objects
+TYPES: dict[str, tuple[str, str]] = {
+    "smallint": ("h", "int16"),
+    "integer": ("i", "int32"),
+    "bigint": ("q", "int64"),
+    "real": ("f", "float32"),
+    "double precision": ("d", "float64"),
+    "decimal": ("d", "float64"),
+    "numeric": ("d", "float64"),
+}
+
+
+class Columns(dict[str, Any]):
+    # column name -> array, with a boolean mask (true where the value was null) for every optional column
+    def __init__(self) -> None:
+        super().__init__()
+        self.masks: dict[str, Any] = {}
+        self.rows = 0
+
+    def __repr__(self) -> str:
+        return f"<Columns rows={self.rows} columns={list(self)!r}>"
+
+
+class _Accumulator:
+    __slots__ = ("key", "position", "optional", "typecode", "dtype", "values", "mask")
+
+    def __init__(self, key: str, column: Column[Any, Any], position: int) -> None:
+        self.key = key
+        self.position = position
+        self.optional = column.optional
+        self.typecode, self.dtype = TYPES.get(column.db_datatype, (None, None))
+        self.values: list[Any] = []
+        self.mask: list[Any] = []
+
+        if numpy is None and self.typecode is not None:
+            self.values = array.array(self.typecode)  # type: ignore
+            self.mask = array.array("B")  # type: ignore
+
+    def add(self, values: tuple[Any, ...]) -> None:
+        if self.optional:
+            mask = [value is None for value in values]
+
+            if self.typecode is not None and True in mask:
+                # nulls are left as zeros in fixed width arrays, the mask says which ones they were
+                values = tuple(0 if value is None else value for value in values)
+        else:
+            mask = None
+
+        if numpy is not None:
+            self.values.append(numpy.array(values, dtype=self.dtype or object))
+
+            if mask is not None:
+                self.mask.append(numpy.array(mask, dtype=bool))
+        else:
+            self.values.extend(values)
+
+            if mask is not None:
+                self.mask.extend(mask)
+
+    def finish(self, columns: Columns) -> None:
+        if numpy is not None:
+            dtype = self.dtype or object
+            columns[self.key] = numpy.concatenate(self.values) if self.values else numpy.empty(0, dtype=dtype)
+
+            if self.optional:
+                columns.masks[self.key] = numpy.concatenate(self.mask) if self.mask else numpy.empty(0, dtype=bool)
+        else:
+            columns[self.key] = self.values
+
+            if self.optional:
+                columns.masks[self.key] = self.mask
+
+
+class ColumnarReader:
+    def __init__(self, columns: list[tuple[str, Column[Any, Any], int]]) -> None:
+        self._accumulators = [_Accumulator(key, column, position) for key, column, position in columns]
+        self._rows = 0
+
+    def add(self, records: list[Record]) -> None:
+        if not records:
+            return
+
+        # transposing in one go keeps the per value work inside C
+        transposed = list(zip(*records))
+
+        for accumulator in self._accumulators:
+            accumulator.add(transposed[accumulator.position])
+
+        self._rows += len(records)
+
+    def finish(self) -> Columns:
+        columns = Columns()
+        columns.rows = self._rows
+
+        for accumulator in self._accumulators:
+            accumulator.finish(columns)
+
+        return columns
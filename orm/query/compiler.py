@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Hashable, Iterable, NamedTuple, Protocol, Sequence
+
+from ..column import Column
+from ..where_query import Exists, Subquery, WhereGroup, _read_only
+
+if TYPE_CHECKING:
+    from ..where_query import WhereQuery
+
+__all__ = ("Compiler", "LiteralCompiler", "CompiledQuery", "QueryCacheInfo", "QueryCache", "query_cache")
+
+
+class _Compilable(Protocol):
+    def _compile(self, compiler: Compiler) -> str:
+        ...
+
+
+class Compiler:
+    def __init__(self) -> None:
+        self.parameters = 0
+
+    def param(self, value: Any = None) -> str:
+        self.parameters += 1
+        return f"${self.parameters}"
+
+
+class LiteralCompiler(Compiler):
+    # for statements that cant take bind parameters, like the predicate of a partial index
+    def param(self, value: Any = None) -> str:
+        return literal(value)
+
+
+def literal(value: Any) -> str:
+    if value is None:
+        return "null"
+
+    if isinstance(value, bool):
+        return "true" if value else "false"
+
+    if isinstance(value, int):
+        return repr(value)
+
+    if isinstance(value, float):
+        # inf and nan only exist as strings
+        return repr(value) if math.isfinite(value) else f"'{value!r}'::double precision"
+
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+
+    if isinstance(value, (list, tuple)):
+        return f"array[{', '.join(literal(item) for item in value)}]"  # type: ignore
+
+    raise Exception(f"Cannot write {type(value).__name__} as a sql literal")
+
+
+class CompiledQuery:
+    __slots__ = ("query", "parameters")
+
+    def __init__(self, query: str, parameters: int) -> None:
+        self.query = query
+        self.parameters = parameters
+
+    def __repr__(self) -> str:
+        return f"<CompiledQuery query={self.query!r} parameters={self.parameters}>"
+
+
+class QueryCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+# lru of compiled sql keyed by the shape returned from a builder's `_bind`
+class QueryCache:
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, CompiledQuery] = OrderedDict()
+
+    def get(self, key: Hashable, builder: _Compilable) -> CompiledQuery:
+        try:
+            compiled = self._entries[key]
+        except KeyError:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return compiled
+
+        compiler = Compiler()
+        compiled = CompiledQuery(builder._compile(compiler), compiler.parameters)
+
+        if self.maxsize > 0:
+            self._entries[key] = compiled
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return compiled
+
+    def resize(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+
+        while len(self._entries) > max(maxsize, 0):
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> QueryCacheInfo:
+        return QueryCacheInfo(self.hits, self.misses, self.evictions, len(self._entries), self.maxsize)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+query_cache = QueryCache()
+
+# the whole list is bound as a single array so the sql doesnt change with its length
+ARRAY_OPS = {"= any", "!= all"}
+NULL_OPS = {"is null", "is not null"}
+
+
+# `bind_wheres` and `compile_wheres` must walk the clauses in the same order, the
+# values appended by the first line up with the placeholders handed out by the second
+
+def _bind_operand(value: Any, parameters: list[Any]) -> Hashable:
+    if isinstance(value, Column):
+        return value._key
+
+    if isinstance(value, Subquery):
+        return _read_only(value)._bind(parameters)
+
+    parameters.append(value)
+    return None
+
+
+def _compile_operand(value: Any, compiler: Compiler) -> str:
+    if isinstance(value, Column):
+        return value._to_full_name()
+
+    if isinstance(value, Subquery):
+        return f"({value._compile(compiler)})"
+
+    return compiler.param(value)
+
+
+def bind_where(where: WhereQuery, parameters: list[Any]) -> Hashable:
+    # the shape of a comparison against a plain value never changes, so it is only worked out once
+    if (shape := where._shape) is not None:
+        parameters.append(where.value)
+        return shape
+
+    if isinstance(where, WhereGroup):
+        return (where.joiner, tuple([bind_where(child, parameters) for child in where.children]))
+
+    if isinstance(where, Exists):
+        return ("exists", where.value._bind(parameters))
+
+    op = where.op
+    operand: Any = where.value
+
+    if op in NULL_OPS:
+        value = None
+    elif op == "between":
+        value = (_bind_operand(operand[0], parameters), _bind_operand(operand[1], parameters))
+    elif not isinstance(operand, (Column, Subquery)):
+        parameters.append(operand)
+        shape = where._shape = (where.column._key, op)
+        return shape
+    else:
+        value = _bind_operand(operand, parameters)
+
+    return (where.column._key, op, value)
+
+
+def compile_where(where: WhereQuery, compiler: Compiler) -> str:
+    if isinstance(where, WhereGroup):
+        if where.joiner == "not":
+            child = compile_where(where.children[0], compiler)
+            return f"not {child}" if isinstance(where.children[0], WhereGroup) else f"not ({child})"
+
+        return "(" + f" {where.joiner} ".join(compile_where(child, compiler) for child in where.children) + ")"
+
+    if isinstance(where, Exists):
+        return f"exists ({where.value._compile(compiler)})"
+
+    column = where.column._to_full_name()
+
+    if where.op in NULL_OPS:
+        return f"{column} {where.op}"
+
+    if where.op == "between":
+        return f"{column} between {_compile_operand(where.value[0], compiler)} and {_compile_operand(where.value[1], compiler)}"
+
+    if where.op in ARRAY_OPS:
+        return f"{column} {where.op}({_compile_operand(where.value, compiler)})"
+
+    return f"{column} {where.op} {_compile_operand(where.value, compiler)}"
+
+
+def bind_wheres(wheres: list[tuple[str, WhereQuery]], parameters: list[Any]) -> tuple[Hashable, ...]:
+    # flat joiner, shape, joiner, shape, ... is noticeably cheaper to build than nested pairs
+    shapes: list[Hashable] = []
+
+    for joiner, where in wheres:
+        shapes.append(joiner)
+        shapes.append(bind_where(where, parameters))
+
+    return tuple(shapes)
+
+
+def compile_wheres(wheres: list[tuple[str, WhereQuery]], compiler: Compiler) -> str:
+    where_clause: list[str] = []
+
+    for i, (joiner, where) in enumerate(wheres):
+        clause = compile_where(where, compiler)
+        where_clause.append(clause if i == 0 else f"{joiner} {clause}")
+
+    return " ".join(where_clause)
+
+
+def subqueries(where: WhereQuery) -> list[Subquery]:
+    if isinstance(where, WhereGroup):
+        return [subquery for child in where.children for subquery in subqueries(child)]
+
+    if where.op == "between":
+        return [value for value in where.value if isinstance(value, Subquery)]
+
+    return [where.value] if isinstance(where.value, Subquery) else []
+
+
+# one array per column keeps a statement the same no matter how many rows there are, unnest turns
+# them back into rows on the server
+def bind_arrays(rows: list[Sequence[Any]], indexes: Iterable[int], parameters: list[Any]) -> None:
+    for index in indexes:
+        parameters.append([row[index] for row in rows])
+
+
+def compile_arrays(columns: Iterable[Column[Any, Any]], compiler: Compiler) -> str:
+    return ", ".join([f"{compiler.param()}::{column.db_datatype}[]" for column in columns])
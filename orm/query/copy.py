@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import inspect
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterable, AsyncIterator, BinaryIO, Callable, Coroutine, Literal, Union, cast
+
+from ..utils import T_T
+from .base import QueryBuilder
+from .instrument import instrumentation
+from .router import acquire
+
+if TYPE_CHECKING:
+    from ..column import Column
+    from ..utils import Executor
+
+__all__ = ("CopyFromQueryBuilder",)
+
+CopyFormat = Literal["binary", "csv", "text"]
+# what asyncpg copies into and out of
+CopyOutput = Union["os.PathLike[Any]", BinaryIO, Callable[[bytes], Coroutine[Any, Any, None]]]
+CopySource = Union["os.PathLike[Any]", BinaryIO, AsyncIterable[bytes]]
+
+# how much of an async file is read per copy message when loading
+READ_SIZE = 256 * 1024
+
+
+def copy_output(output: Any) -> CopyOutput:
+    # asyncpg handles paths, blocking file objects (written from a thread) and coroutine functions,
+    # async file objects get their write method passed through instead of being written from a thread
+    if isinstance(output, (str, os.PathLike)):
+        return Path(cast("str | os.PathLike[str]", output))
+
+    if inspect.iscoroutinefunction(getattr(output, "write", None)):
+        return output.write
+
+    return output
+
+
+async def _read_chunks(source: Any) -> AsyncIterator[bytes]:
+    while chunk := await source.read(READ_SIZE):
+        yield chunk
+
+
+def copy_source(source: Any) -> CopySource:
+    if isinstance(source, (str, os.PathLike)):
+        return Path(cast("str | os.PathLike[str]", source))
+
+    if isinstance(source, AsyncIterable):
+        return cast(AsyncIterable[bytes], source)
+
+    if inspect.iscoroutinefunction(getattr(source, "read", None)):
+        return _read_chunks(source)
+
+    return source
+
+
+def copy_count(status: str) -> int:
+    # "COPY 123"
+    return int(status.rsplit(" ", 1)[-1])
+
+
+class CopyFromQueryBuilder(QueryBuilder[T_T]):
+    _writes = True
+
+    def __init__(
+        self,
+        table: type[T_T],
+        source: Any,
+        *,
+        columns: list[Column[Any, Any]] | None = None,
+        format: CopyFormat = "binary",
+        header: bool | None = None,
+    ) -> None:
+        super().__init__(table)
+        self.source = source
+        self.columns = columns or table._metadata.columns
+        self.format: CopyFormat = format
+        self.header = header
+
+        for column in self.columns:
+            if column.table is not table:
+                raise Exception(f"{column.table.__name__}.{column.name} is not a column of {table.__name__}")
+
+    async def execute(self, conn: Executor) -> int:
+        columns = [column.name for column in self.columns]
+        with instrumentation.start(self, "copy") as event:
+            # what asyncpg sends for copy_to_table
+            names = ",".join([f"\"{name}\"" for name in columns])
+            event.built(f"copy \"{self.table._metadata.name}\"({names}) from stdin (format {self.format})")
+
+            async with acquire(conn, True) as conn:
+                status = await conn.copy_to_table(
+                    self.table._metadata.name,
+                    source=copy_source(self.source),
+                    columns=columns,
+                    format=self.format,
+                    header=self.header,
+                )
+
+                await self._written(conn)
+
+            count = copy_count(status)
+            event.fetched(count)
+
+        return count
+
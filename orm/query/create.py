@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
+from typing_extensions import Self
+
 from ..utils import T_T
 from .base import QueryBuilder
 
+if TYPE_CHECKING:
+    from ..indexes import Index
+
 
 class CreateTableQueryBuilder(QueryBuilder[T_T]):
+    # ddl has to run on the primary, replicas are read only
+    _writes = True
+
     def build(self) -> tuple[str, list[str]]:
         column_defs: list[str] = []
 
@@ -15,10 +25,55 @@ class CreateTableQueryBuilder(QueryBuilder[T_T]):
                 col_type.append("primary key")
 
             if other_column := column.foreign:
-                col_type.append(f"references \"{other_column.table._metadata.name}\"({other_column._to_full_name})")
+                col_type.append(f"references \"{other_column.table._metadata.name}\"(\"{other_column.name}\")")
 
-            column_def = f"{column._to_full_name()} {column.db_datatype} {'' if column.optional else 'not null'} {' '.join(col_type)}"
+            column_def = f"\"{column.name}\" {column.db_datatype} {'' if column.optional else 'not null'} {' '.join(col_type)}"
             column_defs.append(column_def)
 
         query = f"create table \"{self.table._metadata.name}\" ({','.join(column_defs)})"
         return query, []
+
+
+class CreateIndexQueryBuilder(QueryBuilder[T_T]):
+    _writes = True
+
+    def __init__(self, table: type[T_T], index: Index, *, concurrently: bool = False, if_not_exists: bool = False) -> None:
+        super().__init__(table)
+        self.index = index
+        self._concurrently = concurrently
+        self._if_not_exists = if_not_exists
+
+    # builds the index without locking out writes, cant run inside a transaction
+    def concurrently(self) -> Self:
+        self._concurrently = True
+        return self
+
+    def if_not_exists(self) -> Self:
+        self._if_not_exists = True
+        return self
+
+    def build(self) -> tuple[str, list[str]]:
+        index = self.index
+        query_parts = ["create unique index" if index.unique else "create index"]
+
+        if self._concurrently:
+            query_parts.append("concurrently")
+
+        if self._if_not_exists:
+            query_parts.append("if not exists")
+
+        query_parts.append(f"\"{index.name(self.table)}\" on \"{self.table._metadata.name}\"")
+
+        if index.using:
+            query_parts.append(f"using {index.using}")
+
+        query_parts.append(f"({','.join(index.key_sql())})")
+
+        if index.include:
+            include = ",".join([f"\"{column.name}\"" for column in index.include])
+            query_parts.append(f"include ({include})")
+
+        if (where := index.where_sql()) is not None:
+            query_parts.append(f"where {where}")
+
+        return " ".join(query_parts), []
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Hashable
+
+from ..where_query import Subquery
+from .compiler import Compiler
+from .select import TupleSelectQueryBuilder
+
+if TYPE_CHECKING:
+    from ..column import Column
+    from .base import QueryBuilder
+
+__all__ = ("CommonTableExpression", "cte")
+
+
+class CommonTableExpression:
+    # a query run once at the start of another, attached with `with_` and read through `column`,
+    # inserts, updates and deletes are allowed here and their returning rows are what the rest of the query sees
+    def __init__(self, name: str, query: QueryBuilder[Any], *, materialized: bool | None = None) -> None:
+        if isinstance(query, TupleSelectQueryBuilder):
+            raise Exception("Joined queries cannot be used as a common table expression, their columns are renamed")
+
+        self.name = name
+        self.query = query
+        self.materialized = materialized
+
+    # `select "name"."column" from "name"`, to compare against with in_, not_in or exists
+    def column(self, column: Column[Any, Any]) -> CteColumn:
+        if column.table is not self.query.table:
+            raise Exception(f"{column.table.__name__}.{column.name} is not a column of {self.name}")
+
+        return CteColumn(self, column)
+
+    def _bind(self, parameters: list[Any]) -> Hashable:
+        return (self.name, self.materialized, self.query._bind(parameters))
+
+    def _compile(self, compiler: Compiler) -> str:
+        materialized = {None: "", True: "materialized ", False: "not materialized "}[self.materialized]
+        return f"\"{self.name}\" as {materialized}({self.query._compile(compiler)})"
+
+
+class CteColumn(Subquery):
+    def __init__(self, cte: CommonTableExpression, column: Column[Any, Any]) -> None:
+        self.cte = cte
+        self.column = column
+
+    def _bind(self, parameters: list[Any]) -> Hashable:
+        return (CteColumn, self.cte.name, self.column.name)
+
+    def _compile(self, compiler: Compiler) -> str:
+        return f"select \"{self.cte.name}\".\"{self.column.name}\" from \"{self.cte.name}\""
+
+    def _tables(self) -> set[str]:
+        return self.cte.query._tables()
+
+    def _width(self) -> int | None:
+        return 1
+
+
+def cte(name: str, query: QueryBuilder[Any], *, materialized: bool | None = None) -> CommonTableExpression:
+    return CommonTableExpression(name, query, materialized=materialized)
@@ -1,11 +1,14 @@
 from __future__ import annotations
-from typing import Literal, Never, Self, overload
+from typing import Any, Hashable, Literal, Never, Self, overload
 
 from ..utils import T_T
 from .base import QueryBuilder
+from .compiler import Compiler, bind_wheres, compile_wheres
 from ..where_query import WhereQuery
 
 class DeleteQueryBuilder(QueryBuilder[T_T]):
+    _writes = True
+
     def __init__(self, table: type[T_T]):
         self.table = table
         self._wheres: list[tuple[str, WhereQuery]] = []
@@ -41,25 +44,13 @@ class DeleteQueryBuilder(QueryBuilder[T_T]):
     def and_where(self, query: WhereQuery) -> Self:
         return self.where("and", query)
 
-    def build(self) -> tuple[str, list[str]]:
-        values: list[str] = []
+    def _bind(self, parameters: list[Any]) -> Hashable:
+        return (DeleteQueryBuilder, self.table, bind_wheres(self._wheres, parameters))
 
-        query_parts: list[str] = ["delete from", self.table._metadata.name]
+    def _compile(self, compiler: Compiler) -> str:
+        query_parts: list[str] = [f"delete from \"{self.table._metadata.name}\""]
 
         if self._wheres:
-            where_clause: list[str] = []
-
-            for i, (joiner, where) in enumerate(self._wheres, 1):
-                if i == 1:
-                    where_clause.append(f"{where.column._to_full_name()} {where.op} ${i}")
-                else:
-                    where_clause.append(f"{joiner} {where.column._to_full_name()} {where.op} ${i}")
-
-            query_parts.append(f"where {' '.join(where_clause)}")
-
-        query_parts.append
+            query_parts.append(f"where {compile_wheres(self._wheres, compiler)}")
 
-        return (
-            " ".join(query_parts),
-            values
-        )
+        return " ".join(query_parts)
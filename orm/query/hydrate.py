@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from functools import cache
+from typing import TYPE_CHECKING, Any, Callable, ClassVar
+
+from ..utils import T_T, Missing
+
+if TYPE_CHECKING:
+    from asyncpg import Record
+
+    from ..table import Table
+
+__all__ = ("RowView", "SlicePlan", "hydrator", "view", "join_hydrator")
+
+# where each part of a joined row starts, a table for every joined table and None for every extra column,
+# with the indexes of the columns selected from that table or None when all of them are
+SlicePlan = tuple[tuple["type[Table] | None", int, "tuple[int, ...] | None"], ...]
+
+
+def identity(record: Record) -> Record:
+    return record
+
+
+def _positions(table: type[Table], offset: int, columns: tuple[int, ...] | None) -> dict[int, int]:
+    # where each selected column sits in the record
+    if columns is None:
+        columns = tuple(range(len(table._metadata.columns)))
+
+    return {index: offset + position for position, index in enumerate(columns)}
+
+
+@cache
+def hydrator(table: type[T_T], offset: int = 0, columns: tuple[int, ...] | None = None) -> Callable[[Record], T_T]:
+    # the select builders always emit the selected columns in metadata order so each value can be read by position,
+    # columns that werent selected are left missing and raise when read
+    positions = _positions(table, offset, columns)
+    values = ", ".join(
+        f"record[{positions[column.index]}]" if column.index in positions else "_missing"
+        for column in table._metadata.columns
+    )
+
+    source = (
+        "def hydrate(record):\n"
+        "    row = _new(_table)\n"
+        f"    row._values = [{values}]\n"
+        "    return row\n"
+    )
+    namespace: dict[str, Any] = {}
+    exec(source, {"_new": object.__new__, "_table": table, "_missing": Missing}, namespace)
+
+    return namespace["hydrate"]
+
+
+class RowView:
+    __slots__ = ("_record",)
+
+    _table: ClassVar[type[Table]]
+    _positions: ClassVar[dict[int, int]]
+
+    def __init__(self, record: Record) -> None:
+        self._record = record
+
+    def __repr__(self) -> str:
+        columns = self._table._metadata.columns
+        attrs = " ".join(
+            f"{column.name}={self._record[self._positions[column.index]]!r}"
+            for column in columns
+            if column.index in self._positions
+        )
+
+        return f"<{self.__class__.__name__} {attrs}>"
+
+
+def _column_property(index: int) -> property:
+    return property(lambda self: self._record[index])
+
+
+def _unselected_property(table: type[Table], name: str) -> property:
+    def unselected(self: RowView) -> Any:
+        raise AttributeError(f"{table.__name__}.{name} was not selected by the query")
+
+    return property(unselected)
+
+
+@cache
+def view(table: type[T_T], offset: int = 0, columns: tuple[int, ...] | None = None) -> type[RowView]:
+    positions = _positions(table, offset, columns)
+    attrs: dict[str, Any] = {"__slots__": (), "_table": table, "_positions": positions}
+
+    for column in table._metadata.columns:
+        if column.index in positions:
+            attrs[column.name] = _column_property(positions[column.index])
+        else:
+            attrs[column.name] = _unselected_property(table, column.name)
+
+    return type(f"{table.__name__}View", (RowView,), attrs)
+
+
+@cache
+def join_hydrator(plan: SlicePlan, views: bool = False) -> Callable[[Record], tuple[Any, ...]]:
+    factory = view if views else hydrator
+    namespace_globals: dict[str, Any] = {}
+    parts: list[str] = []
+
+    for i, (table, offset, columns) in enumerate(plan):
+        if table is None:
+            parts.append(f"record[{offset}]")
+        else:
+            namespace_globals[f"_hydrate_{i}"] = factory(table, offset, columns)
+            parts.append(f"_hydrate_{i}(record)")
+
+    source = (
+        "def hydrate(record):\n"
+        f"    return ({', '.join(parts)},)\n"
+    )
+    namespace: dict[str, Any] = {}
+    exec(source, namespace_globals, namespace)
+
+    return namespace["hydrate"]
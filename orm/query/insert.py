@@ -1,44 +1,65 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Hashable
 
 from ..utils import T_T, Missing
 from .base import QueryBuilder
+from .compiler import Compiler
 
 if TYPE_CHECKING:
+    from asyncpg import Record
+
+    from ..column import Column
     from ..table import Table
-    from ..utils import Connection
+    from ..utils import Executor
+
+
+def column_value(table: type[Table], instance: Table, column: Column[Any, Any]) -> Any:
+    if (value := getattr(instance, column.name, Missing)) is not Missing:
+        return value
+
+    elif default := column.default:
+        # kept on the row so it knows its own key afterwards and a rebuild sends the same value
+        value = instance._values[column.index] = default()
+        return value
+
+    else:
+        raise Exception(f"Missing required column {table.__name__}.{column.name}")
 
 
 class InsertQueryBuilder(QueryBuilder[T_T]):
+    _writes = True
+
     def __init__(self, table: Table):
         self.table_instance = table
         self.table = type(table)
 
-    def build(self) -> tuple[str, list[Any]]:
-        columns: list[str] = []
-        values: list[Any] = []
-
+    def _bind(self, parameters: list[Any]) -> Hashable:
         for column in self.table._metadata.columns:
-            columns.append(column._to_full_name())
+            parameters.append(column_value(self.table, self.table_instance, column))
+
+        return (InsertQueryBuilder, self.table)
 
-            if (value := getattr(self.table_instance, column.name, Missing)) is not Missing:
-                values.append(value)
+    def _written_keys(self, records: list[Record] | None) -> list[Any] | None:
+        if records is not None:
+            return super()._written_keys(records)
 
-            elif default := column.default:
-                values.append(default())
+        primary = self.table._metadata.primary
 
-            else:
-                raise Exception(f"Missing required column {self.table.__name__}.{column.name}")
+        if len(primary) == 1 and (key := getattr(self.table_instance, primary[0].name, Missing)) is not Missing:
+            return [key]
 
-        column_placeholders = [f"${i + 1}" for i in range(len(columns))]
+    def _compile(self, compiler: Compiler) -> str:
+        columns: list[str] = []
+        column_placeholders: list[str] = []
+
+        for column in self.table._metadata.columns:
+            columns.append(f"\"{column.name}\"")
+            column_placeholders.append(compiler.param())
 
-        return (
-            f"insert into \"{self.table._metadata.name}\"({','.join(columns)}) values ({','.join(column_placeholders)})",
-            values,
-        )
+        return f"insert into \"{self.table._metadata.name}\"({','.join(columns)}) values ({','.join(column_placeholders)}) returning {','.join(columns)}"
 
-    async def fetchone(self, conn: Connection) -> T_T:
+    async def fetchone(self, conn: Executor) -> T_T:
         row = await super().fetchone(conn)
         assert row is not None
 
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import deque
+from functools import lru_cache
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, NamedTuple, Protocol
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from .base import QueryBuilder
+
+__all__ = ("QueryEvent", "QueryHook", "Instrumentation", "instrumentation", "FingerprintStats", "QueryStats", "fingerprint")
+
+log = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w\"$])\d+(?:\.\d+)?")
+_PLACEHOLDER = re.compile(r"\$\d+")
+# multi row values lists change length with the number of rows
+_ROWS = re.compile(r"\(\?(?:,\s*\?)*\)(?:\s*,\s*\(\?(?:,\s*\?)*\))+")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(query: str) -> str:
+    # queries with the same shape share a fingerprint whatever values or how many rows they were run with
+    query = _STRING.sub("?", query)
+    query = _NUMBER.sub("?", query)
+    query = _PLACEHOLDER.sub("?", query)
+
+    return _ROWS.sub("(...)", query)
+
+
+class QueryEvent:
+    __slots__ = (
+        "builder", "source", "table", "operation", "query", "fingerprint", "rows", "error",
+        "build_time", "db_time", "hydrate_time", "_hooks", "_start", "_mark",
+    )
+
+    def __init__(self, builder: QueryBuilder[Any], operation: str, hooks: list[QueryHook]) -> None:
+        self.builder = type(builder).__name__
+        # the builder itself, for hooks that want more than the sql
+        self.source = builder
+        self.table = builder.table._metadata.name
+        self.operation = operation
+        self.query = ""
+        self.fingerprint = ""
+        self.rows = 0
+        self.error: BaseException | None = None
+        self.build_time = 0.0
+        self.db_time = 0.0
+        self.hydrate_time = 0.0
+        self._hooks = hooks
+        self._start = self._mark = time.perf_counter()
+
+    @property
+    def total(self) -> float:
+        return self.build_time + self.db_time + self.hydrate_time
+
+    # the builders call these as the query moves along, time between two calls goes to the phase that ended
+
+    def built(self, query: str) -> None:
+        now = time.perf_counter()
+        self.build_time = now - self._mark
+        self._mark = now
+
+        self.query = query
+        self.fingerprint = fingerprint(query)
+
+        for hook in self._hooks:
+            hook.before(self)
+
+    def fetched(self, rows: int) -> None:
+        now = time.perf_counter()
+        # includes waiting for a pool connection
+        self.db_time = now - self._mark
+        self._mark = now
+
+        self.rows = rows
+
+    def finished(self) -> None:
+        if self.db_time:
+            self.hydrate_time = time.perf_counter() - self._mark
+
+        for hook in self._hooks:
+            hook.after(self)
+
+    def failed(self, error: BaseException) -> None:
+        now = time.perf_counter()
+
+        if self.query and not self.db_time:
+            self.db_time = now - self._mark
+        elif not self.query:
+            self.build_time = now - self._mark
+
+        self.error = error
+
+        for hook in self._hooks:
+            hook.after(self)
+
+    # the builders run a query inside `with instrumentation.start(...) as event`, which ends the event however it goes
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None) -> None:
+        # a stream closed before its last row was read stopped early, it didnt fail
+        if exc is None or isinstance(exc, GeneratorExit):
+            self.finished()
+        else:
+            self.failed(exc)
+
+    def __repr__(self) -> str:
+        return (
+            f"<QueryEvent {self.builder} {self.operation} table={self.table!r} rows={self.rows} "
+            f"build={self.build_time:.6f} db={self.db_time:.6f} hydrate={self.hydrate_time:.6f} error={self.error!r}>"
+        )
+
+
+class _NoEvent:
+    # stands in for an event while nothing is listening, so the builders dont need to check
+    __slots__ = ()
+
+    def built(self, query: str) -> None:
+        pass
+
+    def fetched(self, rows: int) -> None:
+        pass
+
+    def finished(self) -> None:
+        pass
+
+    def failed(self, error: BaseException) -> None:
+        pass
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None) -> None:
+        pass
+
+
+NO_EVENT = _NoEvent()
+
+
+class QueryHook(Protocol):
+    # hooks run on the event loop in the middle of the query and must not block, anything slow belongs in a task,
+    # per query state lives on the event so concurrent queries never see each others
+    def before(self, event: QueryEvent) -> None:
+        ...
+
+    def after(self, event: QueryEvent) -> None:
+        ...
+
+
+class Instrumentation:
+    def __init__(self) -> None:
+        self.hooks: list[QueryHook] = []
+
+    def add(self, hook: QueryHook) -> None:
+        # hooks are replaced rather than appended to, events keep the list they started with
+        self.hooks = [*self.hooks, hook]
+
+    def remove(self, hook: QueryHook) -> None:
+        self.hooks = [existing for existing in self.hooks if existing is not hook]
+
+    def start(self, builder: QueryBuilder[Any], operation: str) -> QueryEvent | _NoEvent:
+        if not self.hooks:
+            return NO_EVENT
+
+        return QueryEvent(builder, operation, self.hooks)
+
+
+instrumentation = Instrumentation()
+
+
+class FingerprintStats(NamedTuple):
+    fingerprint: str
+    table: str
+    count: int
+    errors: int
+    rows: int
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+    build_time: float
+    db_time: float
+    hydrate_time: float
+
+
+class _Samples:
+    __slots__ = ("table", "count", "errors", "rows", "total", "build_time", "db_time", "hydrate_time", "durations")
+
+    def __init__(self, table: str, max_samples: int) -> None:
+        self.table = table
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.total = 0.0
+        self.build_time = 0.0
+        self.db_time = 0.0
+        self.hydrate_time = 0.0
+        self.durations: deque[float] = deque(maxlen=max_samples)
+
+
+def _percentile(durations: list[float], percent: float) -> float:
+    # nearest rank
+    return durations[min(len(durations) - 1, int(len(durations) * percent))]
+
+
+class QueryStats:
+    def __init__(self, *, slow: float | None = None, max_samples: int = 1000, logger: logging.Logger | None = None) -> None:
+        self.slow = slow
+        self.max_samples = max_samples
+        self.logger = logger or log
+        self._samples: dict[str, _Samples] = {}
+
+    def before(self, event: QueryEvent) -> None:
+        pass
+
+    def after(self, event: QueryEvent) -> None:
+        key = event.fingerprint or f"<{event.builder} {event.operation}>"
+
+        if (samples := self._samples.get(key)) is None:
+            samples = self._samples[key] = _Samples(event.table, self.max_samples)
+
+        total = event.total
+
+        samples.count += 1
+        samples.rows += event.rows
+        samples.total += total
+        samples.build_time += event.build_time
+        samples.db_time += event.db_time
+        samples.hydrate_time += event.hydrate_time
+        samples.durations.append(total)
+
+        if event.error is not None:
+            samples.errors += 1
+
+        if self.slow is not None and total >= self.slow:
+            self.logger.warning(
+                "slow query (%.3fs, db %.3fs, %d rows) %s",
+                total, event.db_time, event.rows, event.query or key,
+            )
+
+    def stats(self) -> list[FingerprintStats]:
+        # slowest first by time spent overall, percentiles cover the last max_samples runs
+        results: list[FingerprintStats] = []
+
+        for key, samples in self._samples.items():
+            durations = sorted(samples.durations)
+
+            results.append(FingerprintStats(
+                key,
+                samples.table,
+                samples.count,
+                samples.errors,
+                samples.rows,
+                samples.total / samples.count,
+                _percentile(durations, 0.50),
+                _percentile(durations, 0.95),
+                _percentile(durations, 0.99),
+                durations[-1],
+                samples.build_time / samples.count,
+                samples.db_time / samples.count,
+                samples.hydrate_time / samples.count,
+            ))
+
+        results.sort(key=lambda stats: stats.mean * stats.count, reverse=True)
+
+        return results
+
+    def reset(self) -> None:
+        self._samples.clear()
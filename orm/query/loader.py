@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Awaitable, Generic, Hashable, Iterable
+
+import asyncpg
+
+from ..utils import T_T
+from .router import Router
+
+if TYPE_CHECKING:
+    from ..utils import Executor
+
+__all__ = ("LoaderStats", "Loader")
+
+
+class LoaderStats:
+    def __init__(self) -> None:
+        self.loads = 0
+        self.memo_hits = 0
+        self.batches = 0
+        self.keys = 0
+        self.max_batch = 0
+
+    @property
+    def keys_per_batch(self) -> float:
+        return self.keys / self.batches if self.batches else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<LoaderStats loads={self.loads} memo_hits={self.memo_hits} batches={self.batches} "
+            f"keys_per_batch={self.keys_per_batch:.2f} max_batch={self.max_batch}>"
+        )
+
+
+class Loader(Generic[T_T]):
+    def __init__(self, table: type[T_T], conn: Executor, *, max_batch_size: int = 1000, memo: bool = True) -> None:
+        self.table = table
+        self.conn = conn
+        self.max_batch_size = max_batch_size
+        self.memo = memo
+        self.stats = LoaderStats()
+        self._memo: dict[Hashable, asyncio.Future[T_T | None]] = {}
+        self._pending: dict[Hashable, asyncio.Future[T_T | None]] = {}
+        self._scheduled = False
+        self._tasks: set[asyncio.Task[None]] = set()
+        # a single connection cant run two batches at once, pools and routers acquire one per batch
+        self._lock = None if isinstance(conn, (asyncpg.Pool, Router)) else asyncio.Lock()
+
+    def load(self, key: Hashable) -> Awaitable[T_T | None]:
+        self.stats.loads += 1
+
+        if (future := self._memo.get(key)) is None:
+            if (future := self._pending.get(key)) is None:
+                loop = asyncio.get_running_loop()
+                future = self._pending[key] = loop.create_future()
+
+                if len(self._pending) >= self.max_batch_size:
+                    self._dispatch()
+                elif not self._scheduled:
+                    # every key requested before the loop gets back to us goes out in the same query
+                    self._scheduled = True
+                    loop.call_soon(self._dispatch)
+
+            if self.memo:
+                self._memo[key] = future
+        else:
+            self.stats.memo_hits += 1
+
+        # one waiter being cancelled must not cancel the lookup for everyone else sharing it
+        return asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[Hashable]) -> list[T_T | None]:
+        return await asyncio.gather(*(self.load(key) for key in keys))
+
+    def clear(self, key: Hashable | None = None) -> None:
+        if key is None:
+            self._memo.clear()
+        else:
+            self._memo.pop(key, None)
+
+    def _dispatch(self) -> None:
+        self._scheduled = False
+
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+
+        task = asyncio.get_running_loop().create_task(self._load(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _load(self, pending: dict[Hashable, asyncio.Future[T_T | None]]) -> None:
+        primary = self.table._metadata.primary_key
+
+        self.stats.batches += 1
+        self.stats.keys += len(pending)
+        self.stats.max_batch = max(self.stats.max_batch, len(pending))
+
+        try:
+            query = self.table.select().where(primary.in_(list(pending)))
+
+            if self._lock is None:
+                rows = await query.fetch(self.conn)
+            else:
+                async with self._lock:
+                    rows = await query.fetch(self.conn)
+        except BaseException as e:
+            for key, future in pending.items():
+                # failures arent memoized, the next load retries
+                if self._memo.get(key) is future:
+                    del self._memo[key]
+
+                if future.done():
+                    continue
+
+                if isinstance(e, Exception):
+                    future.set_exception(e)
+                    # read it here so an abandoned future doesnt log a never retrieved warning
+                    future.exception()
+                else:
+                    future.cancel()
+
+            if not isinstance(e, Exception):
+                raise
+
+            return
+
+        found = {row._values[primary.index]: row for row in rows}
+
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(found.get(key))
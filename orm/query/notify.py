@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Callable, Iterable
+
+import asyncpg
+
+from .result_cache import _caches, invalidate_tables
+
+if TYPE_CHECKING:
+    from ..utils import Connection
+
+__all__ = ("InvalidationNotifier", "InvalidationListener", "notifier")
+
+# notify payloads are capped at 8000 bytes, anything bigger invalidates the whole table instead
+MAX_PAYLOAD = 7900
+
+
+class InvalidationNotifier:
+    def __init__(self, channel: str = "orm_invalidate") -> None:
+        self.channel = channel
+        self.enabled = False
+        self._batches: dict[int, dict[str, set[Any] | None]] = {}
+
+    def enable(self, channel: str | None = None) -> None:
+        if channel is not None:
+            self.channel = channel
+
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def _payload(self, table: str, keys: Iterable[Any] | None) -> str:
+        message: dict[str, Any] = {"t": table}
+
+        if keys is not None:
+            try:
+                payload = json.dumps({**message, "k": list(keys)}, separators=(",", ":"))
+            except TypeError:  # keys that dont survive json just invalidate the table
+                pass
+            else:
+                if len(payload.encode()) <= MAX_PAYLOAD:
+                    return payload
+
+        return json.dumps(message, separators=(",", ":"))
+
+    # whether writes on this connection need to be passed to notify
+    def tracking(self, conn: Connection) -> bool:
+        return self.enabled or id(conn) in self._batches
+
+    async def notify(self, conn: Connection, table: str, keys: Iterable[Any] | None) -> None:
+        if (pending := self._batches.get(id(conn))) is not None:
+            if keys is None:
+                pending[table] = None
+            elif table not in pending:
+                pending[table] = set(keys)
+            elif (existing := pending[table]) is not None:
+                existing.update(keys)
+
+            return
+
+        await conn.execute("select pg_notify($1, $2)", self.channel, self._payload(table, keys))
+
+    @asynccontextmanager
+    async def batch(self, conn: Connection) -> AsyncGenerator[None, None]:
+        # collects every invalidation made on this connection and sends one message per table right before
+        # the transaction commits, postgres only delivers them if it does, and evicts the local caches again
+        # once it has committed, works whether or not notifications are enabled
+        if id(conn) in self._batches:
+            async with conn.transaction():
+                yield
+
+            return
+
+        pending = self._batches[id(conn)] = {}
+
+        try:
+            async with conn.transaction():
+                yield
+
+                del self._batches[id(conn)]
+
+                if self.enabled:
+                    for table, keys in pending.items():
+                        await self.notify(conn, table, keys)
+
+            # readers on other connections could have cached the old rows between the write and the commit
+            invalidate_tables(*pending)
+        finally:
+            self._batches.pop(id(conn), None)
+
+
+notifier = InvalidationNotifier()
+
+
+class InvalidationListener:
+    def __init__(self, channel: str | None = None) -> None:
+        self.channel = channel or notifier.channel
+        self.conn: Connection | None = None
+        self._owns_conn = False
+        self._callbacks: list[Callable[[str, list[Any] | None], None]] = []
+
+    def add_callback(self, callback: Callable[[str, list[Any] | None], None]) -> None:
+        self._callbacks.append(callback)
+
+    async def start(self, conn: Connection | str) -> None:
+        if isinstance(conn, str):
+            self.conn = await asyncpg.connect(conn)
+            self._owns_conn = True
+        else:
+            self.conn = conn
+
+        self.conn.add_termination_listener(self._on_termination)
+        await self.conn.add_listener(self.channel, self._on_notification)
+
+    async def stop(self) -> None:
+        if (conn := self.conn) is None:
+            return
+
+        self.conn = None
+        conn.remove_termination_listener(self._on_termination)
+
+        if not conn.is_closed():
+            await conn.remove_listener(self.channel, self._on_notification)
+
+            if self._owns_conn:
+                await conn.close()
+
+    def _on_notification(self, conn: Any, pid: int, channel: str, payload: object) -> None:
+        try:
+            message = json.loads(str(payload))
+            table: str = message["t"]
+        except (ValueError, KeyError, TypeError):
+            return
+
+        keys: list[Any] | None = message.get("k")
+
+        # writes from this process too, notifications arrive after the commit and the local
+        # invalidation made when the statement ran can have been refilled with the old rows since
+        invalidate_tables(table)
+
+        for callback in self._callbacks:
+            callback(table, keys)
+
+    def _on_termination(self, conn: Any) -> None:
+        # anything could have been missed while disconnected
+        for cache in list(_caches):
+            cache.clear()
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import uuid
+from typing import TYPE_CHECKING, Any, Callable, Generic, Iterator, cast
+
+from ..column import Column
+from ..utils import T
+from .instrument import instrumentation
+from .router import acquire
+
+if TYPE_CHECKING:
+    from ..utils import Executor
+    from .select import SelectQueryBuilder
+
+__all__ = ("Page", "PageQueryBuilder")
+
+
+# values json cant hold keep their type in a tag, so they come back as what asyncpg expects for the column
+_ENCODERS: dict[type, tuple[str, Callable[[Any], Any]]] = {
+    decimal.Decimal: ("decimal", str),
+    datetime.datetime: ("datetime", datetime.datetime.isoformat),
+    datetime.date: ("date", datetime.date.isoformat),
+    datetime.time: ("time", datetime.time.isoformat),
+    datetime.timedelta: ("timedelta", lambda value: [value.days, value.seconds, value.microseconds]),
+    uuid.UUID: ("uuid", str),
+    bytes: ("bytes", lambda value: base64.b64encode(value).decode()),
+}
+
+_DECODERS: dict[str, Callable[[Any], Any]] = {
+    "decimal": decimal.Decimal,
+    "datetime": datetime.datetime.fromisoformat,
+    "date": datetime.date.fromisoformat,
+    "time": datetime.time.fromisoformat,
+    "timedelta": lambda value: datetime.timedelta(*value),
+    "uuid": uuid.UUID,
+    "bytes": base64.b64decode,
+}
+
+
+def _encode_value(value: Any) -> Any:
+    kind = cast("type[Any]", type(value))
+
+    if value is None or kind in (str, int, float, bool):
+        return value
+
+    if (encoder := _ENCODERS.get(kind)) is None:
+        raise Exception(f"Cannot write {kind.__name__} values into a pagination cursor")
+
+    tag, encode = encoder
+    return {tag: encode(value)}
+
+
+def _decode_value(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+
+    try:
+        [(tag, encoded)] = value.items()  # type: ignore
+        return _DECODERS[tag](encoded)
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        raise Exception("Invalid pagination cursor") from None
+
+
+def encode_cursor(values: list[Any]) -> str:
+    encoded = [_encode_value(value) for value in values]
+    return base64.urlsafe_b64encode(json.dumps(encoded, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, count: int) -> list[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise Exception("Invalid pagination cursor") from None
+
+    if not isinstance(values, list) or len(values) != count:  # type: ignore
+        raise Exception("Invalid pagination cursor")
+
+    return [_decode_value(value) for value in values]  # type: ignore
+
+
+class Page(Generic[T]):
+    def __init__(self, rows: list[T], next: str | None) -> None:
+        self.rows = rows
+        self.next = next
+
+    @property
+    def has_more(self) -> bool:
+        return self.next is not None
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __repr__(self) -> str:
+        return f"<Page rows={len(self.rows)} next={self.next!r}>"
+
+
+class PageQueryBuilder(Generic[T]):
+    def __init__(self, select: SelectQueryBuilder[Any], by: tuple[Column[Any, Any], ...], after: str | None, page_size: int, descending: bool) -> None:
+        for column in by:
+            if column.optional:
+                raise Exception(f"Cannot paginate by nullable column {column.table.__name__}.{column.name}")
+
+        self.select = select
+        self.by = by
+        self.page_size = page_size
+
+        direction = "desc" if descending else "asc"
+        select._order = [(column, direction) for column in by]
+        select._limit = page_size + 1
+
+        if after is not None:
+            select._seek = (by, "<" if descending else ">", decode_cursor(after, len(by)))
+
+    def build(self) -> tuple[str, list[Any]]:
+        return self.select.build()
+
+    async def fetch(self, conn: Executor) -> Page[T]:
+        with instrumentation.start(self.select, "paginate") as event:
+            query, parameters = self.select.build()
+            event.built(query)
+
+            async with acquire(conn, self.select._writes) as conn:
+                records = await self.select._fetch(conn, query, parameters)
+                next_cursor = None
+
+                if len(records) > self.page_size:
+                    records = records[:self.page_size]
+                    last = records[-1]
+                    next_cursor = encode_cursor([last[self.select._column_index(column)] for column in self.by])
+
+                hydrate = self.select._hydrator()
+                rows = [hydrate(record) for record in records]
+                await self.select._load_related(conn, rows)
+
+            event.fetched(len(rows))
+            page = Page(rows, next_cursor)
+
+        return page
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterator
+
+from ..utils import Missing
+
+if TYPE_CHECKING:
+    from ..column import Column
+    from ..table import Table
+    from ..utils import Executor
+
+
+def _chunks(keys: list[Any], size: int) -> Iterator[list[Any]]:
+    for i in range(0, len(keys), size):
+        yield keys[i:i + size]
+
+
+def _keys(rows: list[Table], column: Column[Any, Any]) -> list[Any]:
+    keys = {key for row in rows if (key := row._values[column.index]) is not None and key is not Missing}
+
+    return list(keys)
+
+
+def _attach(row: Table, column: Column[Any, Any], value: Any) -> None:
+    try:
+        row._related[column._to_full_name()] = value
+    except AttributeError:
+        row._related = {column._to_full_name(): value}
+
+
+async def load_related(conn: Executor, rows: list[Table], column: Column[Any, Any], chunk_size: int) -> None:
+    if (target := column.foreign) is None:
+        raise Exception(f"{column.table.__name__}.{column.name} is not a foreign key")
+
+    if not rows:
+        return
+
+    table = type(rows[0])
+
+    if table is column.table:
+        # many to one, each row gets the single row its foreign key points at
+        related: dict[Any, Table] = {}
+
+        for keys in _chunks(_keys(rows, column), chunk_size):
+            for row in await target.table.select().where(target.in_(keys)).fetch(conn):
+                related[row._values[target.index]] = row
+
+        for row in rows:
+            _attach(row, column, related.get(row._values[column.index]))
+
+    elif table is target.table:
+        # one to many, each row gets every row pointing back at it
+        grouped: dict[Any, list[Table]] = {}
+
+        for keys in _chunks(_keys(rows, target), chunk_size):
+            for row in await column.table.select().where(column.in_(keys)).fetch(conn):
+                grouped.setdefault(row._values[column.index], []).append(row)
+
+        for row in rows:
+            _attach(row, column, grouped.get(row._values[target.index], []))
+
+    else:
+        raise Exception(f"{column.table.__name__}.{column.name} does not relate to {table.__name__}")
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, NamedTuple
+from weakref import WeakKeyDictionary
+
+from asyncpg.prepared_stmt import PreparedStatement
+
+if TYPE_CHECKING:
+    from ..utils import Connection
+    from .base import QueryBuilder
+
+__all__ = ("StatementStats", "PreparedStatements", "prepared_statements")
+
+
+class StatementStats(NamedTuple):
+    prepares: int
+    reuses: int
+    evictions: int
+    connections: int
+    size: int
+
+
+def _revive(raw_conn: Any, query: str, stmt: PreparedStatement[Any]) -> PreparedStatement[Any] | None:
+    # relies on asyncpg internals (checked against the versions pyproject allows), when any of them are
+    # missing the statement is prepared again through the public api instead
+    state = getattr(stmt, "_state", None)
+    released = getattr(stmt, "_con_release_ctr", None)
+    current = getattr(raw_conn, "_pool_release_ctr", None)
+
+    if state is None or released is None or current is None or getattr(state, "closed", True):
+        return None
+
+    if released == current:
+        return stmt
+
+    # asyncpg invalidates statement objects when a connection goes back to the pool even though the
+    # server side statement is still alive, rewrap the existing state instead of preparing again
+    try:
+        return PreparedStatement(raw_conn, query, state)
+    except TypeError:
+        return None
+
+
+class PreparedStatements:
+    def __init__(self, maxsize: int = 256) -> None:
+        self.enabled = False
+        self.maxsize = maxsize
+        self.prepares = 0
+        self.reuses = 0
+        self.evictions = 0
+        self._registries: WeakKeyDictionary[Any, OrderedDict[str, PreparedStatement[Any]]] = WeakKeyDictionary()
+
+    def enable(self, maxsize: int | None = None) -> None:
+        if maxsize is not None:
+            self.maxsize = maxsize
+
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        self._registries.clear()
+
+    async def prepare(self, conn: Connection, query: str) -> PreparedStatement[Any]:
+        # pool proxies are handed out fresh on every acquire, the statements belong to the real connection
+        raw_conn = getattr(conn, "_con", conn)
+
+        try:
+            statements = self._registries[raw_conn]
+        except KeyError:
+            statements = self._registries[raw_conn] = OrderedDict()
+
+        if (stmt := statements.get(query)) is not None and (stmt := _revive(raw_conn, query, stmt)) is not None:
+            statements[query] = stmt
+            statements.move_to_end(query)
+            self.reuses += 1
+
+            return stmt
+
+        stmt = statements[query] = await conn.prepare(query)
+        self.prepares += 1
+
+        while len(statements) > self.maxsize:
+            # dropping the last reference lets asyncpg close the statement on the server
+            statements.popitem(last=False)
+            self.evictions += 1
+
+        return stmt
+
+    async def prewarm(self, conn: Connection, *queries: QueryBuilder[Any] | str) -> None:
+        for query in queries:
+            if not isinstance(query, str):
+                query = query.compile()[0].query
+
+            await self.prepare(conn, query)
+
+    def warm(self, *queries: QueryBuilder[Any] | str) -> Callable[[Connection], Awaitable[None]]:
+        async def init(conn: Connection) -> None:
+            if self.enabled:
+                await self.prewarm(conn, *queries)
+
+        return init
+
+    def stats(self) -> StatementStats:
+        return StatementStats(
+            self.prepares,
+            self.reuses,
+            self.evictions,
+            len(self._registries),
+            sum(len(statements) for statements in self._registries.values()),
+        )
+
+
+prepared_statements = PreparedStatements()
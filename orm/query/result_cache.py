@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Hashable, Iterable, NamedTuple
+from weakref import WeakSet
+
+if TYPE_CHECKING:
+    from asyncpg import Record
+
+__all__ = ("ResultCacheInfo", "ResultCache", "result_cache", "invalidate_tables")
+
+_caches: WeakSet[ResultCache] = WeakSet()
+
+
+class ResultCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+    maxsize: int
+
+
+class _Entry:
+    __slots__ = ("records", "tables", "expires")
+
+    def __init__(self, records: list[Record], tables: frozenset[str], expires: float | None) -> None:
+        self.records = records
+        self.tables = tables
+        self.expires = expires
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)  # type: ignore
+
+    return value
+
+
+class ResultCache:
+    def __init__(self, maxsize: int = 1024, ttl: float | None = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._tables: dict[str, set[Hashable]] = {}
+
+        _caches.add(self)
+
+    def key(self, query: str, parameters: list[Any], one: bool) -> Hashable | None:
+        key = (query, one, tuple(_freeze(parameter) for parameter in parameters))
+
+        try:
+            hash(key)
+        except TypeError:  # parameters that cant be hashed just arent cached
+            return None
+
+        return key
+
+    def get(self, key: Hashable) -> list[Record] | None:
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires is not None and entry.expires < time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+
+        return entry.records
+
+    def put(self, key: Hashable, records: list[Record], tables: Iterable[str], ttl: float | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        ttl = self.ttl if ttl is None else ttl
+        entry = _Entry(records, frozenset(tables), None if ttl is None else time.monotonic() + ttl)
+        self._entries[key] = entry
+
+        for table in entry.tables:
+            self._tables.setdefault(table, set()).add(key)
+
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+
+        for table in entry.tables:
+            if keys := self._tables.get(table):
+                keys.discard(key)
+
+                if not keys:
+                    del self._tables[table]
+
+    def invalidate(self, *tables: str) -> None:
+        for table in tables:
+            for key in list(self._tables.get(table, ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tables.clear()
+
+    def info(self) -> ResultCacheInfo:
+        return ResultCacheInfo(self.hits, self.misses, self.evictions, self.invalidations, len(self._entries), self.maxsize)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+result_cache = ResultCache()
+
+
+def invalidate_tables(*tables: str) -> None:
+    for cache in list(_caches):
+        cache.invalidate(*tables)
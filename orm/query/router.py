@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, nullcontext
+from typing import TYPE_CHECKING, AsyncGenerator, Literal, Sequence, cast
+
+import asyncpg
+
+if TYPE_CHECKING:
+    from ..utils import Connection, Executor, Pool
+
+__all__ = ("PoolStats", "Router")
+
+# a replica that has replayed everything it received isnt behind, however long ago the last write was
+LAG_QUERY = """
+select case
+    when pg_is_in_recovery() and pg_last_wal_receive_lsn() is distinct from pg_last_wal_replay_lsn()
+    then extract(epoch from now() - pg_last_xact_replay_timestamp())
+    else 0
+end
+"""
+
+
+class PoolStats:
+    def __init__(self) -> None:
+        self.acquires = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.acquire_wait_total = 0.0
+        self.acquire_wait_max = 0.0
+        self.lag: float | None = None
+        self.lag_checked = 0.0
+
+    @property
+    def acquire_wait_avg(self) -> float:
+        return self.acquire_wait_total / self.acquires if self.acquires else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<PoolStats acquires={self.acquires} in_flight={self.in_flight} max_in_flight={self.max_in_flight} "
+            f"acquire_wait_avg={self.acquire_wait_avg:.6f} acquire_wait_max={self.acquire_wait_max:.6f} lag={self.lag}>"
+        )
+
+
+class Router:
+    def __init__(
+        self,
+        primary: Pool,
+        replicas: Sequence[Pool] = (),
+        *,
+        strategy: Literal["round_robin", "least_busy"] = "round_robin",
+        max_lag: float | None = None,
+        lag_interval: float = 5.0,
+    ) -> None:
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.strategy = strategy
+        self.max_lag = max_lag
+        self.lag_interval = lag_interval
+        self.stats: dict[Pool, PoolStats] = {pool: PoolStats() for pool in [primary, *self.replicas]}
+        self._round_robin = itertools.cycle(self.replicas)
+        self._lag_checks: set[asyncio.Task[None]] = set()
+        self._checking: set[Pool] = set()
+
+    def _healthy(self, pool: Pool) -> bool:
+        if self.max_lag is None:
+            return True
+
+        stats = self.stats[pool]
+
+        if time.monotonic() - stats.lag_checked > self.lag_interval and pool not in self._checking:
+            self._checking.add(pool)
+
+            task = asyncio.get_running_loop().create_task(self._check_lag(pool))
+            self._lag_checks.add(task)
+            task.add_done_callback(self._lag_checks.discard)
+
+        # replicas are trusted until the first lag check comes back
+        return stats.lag is None or stats.lag <= self.max_lag
+
+    async def _check_lag(self, pool: Pool) -> None:
+        stats = self.stats[pool]
+
+        try:
+            lag = await pool.fetchval(LAG_QUERY)
+        except Exception:  # an unreachable replica is as good as infinitely behind
+            lag = float("inf")
+        finally:
+            self._checking.discard(pool)
+
+        stats.lag = float(lag) if lag is not None else 0.0
+        stats.lag_checked = time.monotonic()
+
+    def choose(self, write: bool = False) -> Pool:
+        if write or not self.replicas:
+            return self.primary
+
+        if self.strategy == "least_busy":
+            healthy = [pool for pool in self.replicas if self._healthy(pool)]
+
+            if healthy:
+                return min(healthy, key=lambda pool: self.stats[pool].in_flight)
+        else:
+            for _ in range(len(self.replicas)):
+                pool = next(self._round_robin)
+
+                if self._healthy(pool):
+                    return pool
+
+        # every replica is too far behind
+        return self.primary
+
+    @asynccontextmanager
+    async def acquire(self, write: bool = False) -> AsyncGenerator[Connection, None]:
+        pool = self.choose(write)
+        stats = self.stats[pool]
+
+        start = time.perf_counter()
+
+        async with pool.acquire() as conn:
+            wait = time.perf_counter() - start
+            stats.acquires += 1
+            stats.acquire_wait_total += wait
+            stats.acquire_wait_max = max(stats.acquire_wait_max, wait)
+
+            stats.in_flight += 1
+            stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+
+            # the pool hands out a proxy that forwards everything to the connection
+            try:
+                yield cast("Connection", conn)
+            finally:
+                stats.in_flight -= 1
+
+    async def close(self) -> None:
+        for task in list(self._lag_checks):
+            task.cancel()
+
+        await asyncio.gather(*(pool.close() for pool in self.stats))
+
+    def __repr__(self) -> str:
+        return f"<Router primary={self.primary!r} replicas={len(self.replicas)} strategy={self.strategy!r}>"
+
+
+def acquire(conn: Executor, write: bool) -> AbstractAsyncContextManager[Connection]:
+    if isinstance(conn, Router):
+        return conn.acquire(write)
+
+    if isinstance(conn, asyncpg.Pool):
+        return conn.acquire()  # type: ignore
+
+    return nullcontext(conn)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Generic, Literal, cast, overload, Self
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Generic, Hashable, Literal, cast, overload, Self
 
 from ..column import Column
 from ..utils import T, T_OT, T_T, Extras
@@ -9,26 +9,66 @@ from ..utils import T_T, T_OT, Extras
 
 from .base import QueryBuilder
 from .column import ColumnQueryBuilder
+from .columnar import Columns, ColumnarReader
+from .copy import CopyFormat, copy_count, copy_output
+from .compiler import Compiler, bind_wheres, compile_wheres, subqueries
+from .hydrate import SlicePlan, hydrator, identity, join_hydrator, view
+from .instrument import instrumentation
+from .paginate import PageQueryBuilder
+from .notify import notifier
+from .prefetch import load_related
+from .result_cache import ResultCache, invalidate_tables, result_cache
+from .router import acquire
 
 if TYPE_CHECKING:
     from ..table import Table
-    from ..utils import Connection
+    from ..utils import Connection, Executor
     from asyncpg import Record
 
+    from .cte import CommonTableExpression
+
 class SelectQueryBuilder(QueryBuilder[T_T], Generic[T_T]):
+    _cache: ResultCache | None = None
+    _cache_ttl: float | None = None
+
     def __init__(self, table: type[T_T]) -> None:
         super().__init__(table)
         self._wheres: list[tuple[str, WhereQuery]] = []
-        self._order: tuple[Column[Any, Any], str] | None = None
+        self._order: list[tuple[Column[Any, Any], str]] = []
         self._groups: list[Column[Any, Any]] = []
         self._limit: int | None = None
+        self._seek: tuple[tuple[Column[Any, Any], ...], str, list[Any]] | None = None
+        self._prefetch: list[tuple[Column[Any, Any], int]] = []
+        # indexes of the columns selected from each table, tables that arent in here have every column selected
+        self._projection: dict[type[Table], tuple[int, ...]] = {}
+        self._ctes: list[CommonTableExpression] = []
+
+    # run these first, in order, each can read the ones before it
+    def with_(self, *ctes: CommonTableExpression) -> Self:
+        for cte in ctes:
+            self._ctes.append(cte)
+
+            if cte.query._writes:
+                # goes to the primary like any other write, and is never answered from the result cache
+                self._writes = True
+
+        return self
+
+    async def _written(self, conn: Connection, records: list[Record] | None = None) -> None:
+        # the returned rows are this querys, so which rows the ctes wrote isnt known
+        for cte in self._ctes:
+            if cte.query._writes:
+                invalidate_tables(cte.query.table._metadata.name)
+
+                if notifier.tracking(conn):
+                    await notifier.notify(conn, cte.query.table._metadata.name, None)
 
     def order_by_asc(self, column: Column[Any, Any]) -> Self:
-        self._order = (column, "asc")
+        self._order.append((column, "asc"))
         return self
 
     def order_by_desc(self, column: Column[Any, Any]) -> Self:
-        self._order = (column, "desc")
+        self._order.append((column, "desc"))
         return self
 
     def group_by(self, column: Column[Any, Any]) -> Self:
@@ -39,6 +79,154 @@ class SelectQueryBuilder(QueryBuilder[T_T], Generic[T_T]):
         self._limit = count
         return self
 
+    # load the rows on the other side of a foreign key with one extra query per relation (and chunk of keys)
+    def prefetch(self, *columns: Column[Any, Any], chunk_size: int = 10_000) -> Self:
+        self._prefetch.extend((column, chunk_size) for column in columns)
+        return self
+
+    async def _load_related(self, conn: Executor, rows: list[Any]) -> None:
+        if not self._prefetch or not rows:
+            return
+
+        if self._hydration != "rows":
+            raise Exception("Related rows can only be prefetched onto full rows")
+
+        for column, chunk_size in self._prefetch:
+            if column.table in self._projection and column.index not in self._projection[column.table]:
+                raise Exception(f"Cannot prefetch through {column.table.__name__}.{column.name}, it is not selected")
+
+            await load_related(conn, self._related_rows(rows, column), column, chunk_size)
+
+    def _related_rows(self, rows: list[Any], column: Column[Any, Any]) -> list[Table]:
+        return rows
+
+    async def fetch(self, conn: Executor) -> list[T_T]:
+        rows = await super().fetch(conn)
+        await self._load_related(conn, rows)
+
+        return rows
+
+    async def fetchone(self, conn: Executor) -> T_T | None:
+        row = await super().fetchone(conn)
+
+        if row is not None:
+            await self._load_related(conn, [row])
+
+        return row
+
+    # serve repeated fetches from a result cache until it expires or one of the tables is written to
+    def cached(self, cache: ResultCache | None = None, *, ttl: float | None = None) -> Self:
+        self._cache = cache if cache is not None else result_cache
+        self._cache_ttl = ttl
+        return self
+
+    def _wheres_of(self) -> list[WhereQuery]:
+        return [where for _, where in self._wheres]
+
+    def _tables(self) -> set[str]:
+        tables = {table._metadata.name for table in self._joined_tables()}
+
+        for cte in self._ctes:
+            tables |= cte.query._tables()
+
+        # cached results depend on the tables read by subqueries too
+        for where in self._wheres_of():
+            for subquery in subqueries(where):
+                tables |= subquery._tables()
+
+        return tables
+
+    # reads inside a transaction can see its uncommitted writes, those must never reach the shared cache
+    def _uses_cache(self, conn: Connection) -> bool:
+        return self._cache is not None and not self._writes and not conn.is_in_transaction()
+
+    async def _fetch(self, conn: Connection, query: str, parameters: list[Any]) -> list[Record]:
+        if not self._uses_cache(conn) or (cache := self._cache) is None or (key := cache.key(query, parameters, False)) is None:
+            return await super()._fetch(conn, query, parameters)
+
+        records = cache.get(key)
+
+        if records is None:
+            records = await super()._fetch(conn, query, parameters)
+            cache.put(key, records, self._tables(), self._cache_ttl)
+
+        return records
+
+    async def _fetchrow(self, conn: Connection, query: str, parameters: list[Any]) -> Record | None:
+        if not self._uses_cache(conn) or (cache := self._cache) is None or (key := cache.key(query, parameters, True)) is None:
+            return await super()._fetchrow(conn, query, parameters)
+
+        records = cache.get(key)
+
+        if records is None:
+            record = await super()._fetchrow(conn, query, parameters)
+            records = [] if record is None else [record]
+            cache.put(key, records, self._tables(), self._cache_ttl)
+
+        return records[0] if records else None
+
+    # read only views over the fetched records instead of full rows
+    def _projected(self, columns: tuple[Column[Any, Any], ...]) -> dict[type[Table], set[int]]:
+        tables = self._joined_tables()
+        grouped: dict[type[Table], set[int]] = {}
+
+        for column in columns:
+            if not any(column.table is table for table in tables):
+                raise Exception(f"{column.table.__name__}.{column.name} is not selected by this query")
+
+            grouped.setdefault(column.table, set()).add(column.index)
+
+        return grouped
+
+    # select only these columns, the others are left unloaded and raise when read, primary keys always come
+    # along since sessions, prefetching and loaders find rows by them
+    def only(self, *columns: Column[Any, Any]) -> Self:
+        for table, indexes in self._projected(columns).items():
+            indexes.update(column.index for column in table._metadata.primary)
+            self._projection[table] = tuple(sorted(indexes))
+
+        return self
+
+    # select everything but these columns
+    def defer(self, *columns: Column[Any, Any]) -> Self:
+        for table, indexes in self._projected(columns).items():
+            selected = self._projection.get(table, range(len(table._metadata.columns)))
+            primary = {column.index for column in table._metadata.primary}
+            self._projection[table] = tuple(index for index in selected if index not in indexes or index in primary)
+
+        return self
+
+    def _joined_tables(self) -> list[type[Table]]:
+        return [self.table]
+
+    def _selected(self, table: type[Table]) -> list[Column[Any, Any]]:
+        columns = table._metadata.columns
+
+        if (indexes := self._projection.get(table)) is None:
+            return columns
+
+        return [columns[index] for index in indexes]
+
+    def _hydrator(self) -> Callable[[Record], Any]:
+        if self._hydration == "raw":
+            return identity
+
+        columns = self._projection.get(self.table)
+
+        if self._hydration == "views":
+            return view(self.table, 0, columns)
+
+        return hydrator(self.table, 0, columns)
+
+    def views(self) -> Self:
+        self._hydration = "views"
+        return self
+
+    # the asyncpg records as is, no hydration at all
+    def raw(self) -> SelectQueryBuilder[Any]:
+        self._hydration = "raw"
+        return self
+
     @overload
     def where(self, arg: Literal["and", "AND", "or", "OR"], query: WhereQuery) -> Self:
         ...
@@ -70,35 +258,211 @@ class SelectQueryBuilder(QueryBuilder[T_T], Generic[T_T]):
     def and_where(self, query: WhereQuery) -> Self:
         return self.where("and", query)
 
-    def build(self) -> tuple[str, list[Any]]:
-        columns = ", ".join([column._to_full_name() for column in self.table._metadata.columns])
+    # the with clause comes before everything else so its parameters are numbered first
+    def _bind(self, parameters: list[Any]) -> Hashable:
+        if not self._ctes:
+            return self._bind_select(parameters)
+
+        ctes = tuple(cte._bind(parameters) for cte in self._ctes)
+        return (ctes, self._bind_select(parameters))
+
+    def _compile(self, compiler: Compiler) -> str:
+        if not self._ctes:
+            return self._compile_select(compiler)
+
+        ctes = ", ".join([cte._compile(compiler) for cte in self._ctes])
+        return f"with {ctes} {self._compile_select(compiler)}"
+
+    def _bind_select(self, parameters: list[Any]) -> Hashable:
+        wheres = bind_wheres(self._wheres, parameters)
+
+        if seek := self._seek:
+            parameters.extend(seek[2])
+
+        if self._limit is not None:
+            parameters.append(self._limit)
+
+        groups = self._groups
+        order = self._order
+
+        return (
+            SelectQueryBuilder,
+            self.table,
+            wheres,
+            tuple([column._key for column in groups]) if groups else None,
+            tuple([(column._key, ty) for column, ty in order]) if order else None,
+            seek and (tuple([column._key for column in seek[0]]), seek[1]),
+            self._limit is not None,
+            tuple(self._projection.items()) if self._projection else None,
+        )
+
+    def _compile_select(self, compiler: Compiler) -> str:
+        columns = ", ".join([column._to_full_name() for column in self._selected(self.table)])
         query_parts = [f"select {columns} from \"{self.table._metadata.name}\""]
 
-        if self._wheres:
-            where_clause: list[str] = []
+        query_parts.extend(self._compile_tail(compiler))
+
+        return " ".join(query_parts)
+
+    def _compile_tail(self, compiler: Compiler) -> list[str]:
+        query_parts: list[str] = []
 
-            for i, (joiner, where) in enumerate(self._wheres, 1):
-                if i == 1:
-                    where_clause.append(f"{where.column._to_full_name()} {where.op} ${i}")
-                else:
-                    where_clause.append(f"{joiner} {where.column._to_full_name()} {where.op} ${i}")
+        wheres = compile_wheres(self._wheres, compiler) if self._wheres else None
 
-            query_parts.append(f"where {' '.join(where_clause)}")
+        if seek := self._seek:
+            columns, op, values = seek
+            seek_clause = f"({', '.join([column._to_full_name() for column in columns])}) {op} ({', '.join([compiler.param(value) for value in values])})"
+
+            query_parts.append(f"where ({wheres}) and {seek_clause}" if wheres else f"where {seek_clause}")
+
+        elif wheres:
+            query_parts.append(f"where {wheres}")
 
         if groups := self._groups:
             groups_query = ",".join([column._to_full_name() for column in groups])
             query_parts.append(f"group by {groups_query}")
 
         if order := self._order:
-            column, ty = order
+            query_parts.append(f"order by {', '.join([f'{column._to_full_name()} {ty}' for column, ty in order])}")
+
+        if self._limit is not None:
+            query_parts.append(f"limit {compiler.param(self._limit)}")
+
+        return query_parts
+
+    async def stream(self, conn: Executor, prefetch: int = 100) -> AsyncIterator[T_T]:
+        count = 0
+
+        with instrumentation.start(self, "stream") as event:
+            query, parameters = self.build()
+            event.built(query)
+
+            hydrate = self._hydrator()
+
+            try:
+                async with acquire(conn, self._writes) as conn, self._transaction(conn):
+                    try:
+                        if self._prefetch:
+                            # related rows are loaded a cursor read at a time instead of one query per row
+                            cursor = await (await self._cursor(conn, query, parameters))
+
+                            while records := await cursor.fetch(prefetch):
+                                rows = [hydrate(record) for record in records]
+                                await self._load_related(conn, rows)
+
+                                for row in rows:
+                                    count += 1
+                                    yield row
+                        else:
+                            async for record in await self._cursor(conn, query, parameters, prefetch):
+                                count += 1
+                                yield hydrate(record)
+                    finally:
+                        await self._written(conn)
+            finally:
+                # rows are hydrated as they are read, so the database time includes the hydration,
+                # and a caller that stops reading early still gets the rows it read counted
+                event.fetched(count)
+
+    async def fetch_chunks(self, conn: Executor, size: int = 1000) -> AsyncIterator[list[T_T]]:
+        count = 0
+
+        with instrumentation.start(self, "fetch_chunks") as event:
+            query, parameters = self.build()
+            event.built(query)
+
+            hydrate = self._hydrator()
+
+            try:
+                async with acquire(conn, self._writes) as conn, self._transaction(conn):
+                    try:
+                        cursor = await (await self._cursor(conn, query, parameters))
+
+                        while records := await cursor.fetch(size):
+                            rows = [hydrate(record) for record in records]
+                            await self._load_related(conn, rows)
+
+                            count += len(rows)
+                            yield rows
+                    finally:
+                        await self._written(conn)
+            finally:
+                event.fetched(count)
+
+    # has postgres write the results straight to a path, a file object (sync or async) or a coroutine
+    # function receiving each chunk of bytes, returns the number of rows copied
+    async def copy_to(self, conn: Executor, output: Any, *, format: CopyFormat = "binary", header: bool | None = None) -> int:
+        with instrumentation.start(self, "copy_to") as event:
+            query, parameters = self.build()
+            event.built(query)
+
+            async with acquire(conn, self._writes) as conn:
+                status = await conn.copy_from_query(query, *parameters, output=copy_output(output), format=format, header=header)
+                await self._written(conn)
+
+            count = copy_count(status)
+            event.fetched(count)
+
+        return count
+
+    def _width(self) -> int | None:
+        return len(self._selected(self.table))
+
+    # the selected columns keyed by the name fetch_columns returns them under
+    def _selected_columns(self) -> list[tuple[str, Column[Any, Any]]]:
+        return [(column.name, column) for column in self._selected(self.table)]
+
+    # numpy arrays (array.array without numpy) per column, read from a cursor without building any rows
+    async def fetch_columns(self, conn: Executor, *columns: Column[Any, Any], chunk_size: int = 10_000) -> Columns:
+        if columns:
+            selected = [(key, column) for key, column in self._selected_columns() if any(column is wanted for wanted in columns)]
+
+            if len(selected) != len(columns):
+                missing = next(column for column in columns if not any(column is found for _, found in selected))
+                raise Exception(f"{missing.table.__name__}.{missing.name} is not selected by this query")
+        else:
+            selected = self._selected_columns()
+
+        reader = ColumnarReader([(key, column, self._column_index(column)) for key, column in selected])
+        count = 0
+
+        with instrumentation.start(self, "fetch_columns") as event:
+            query, parameters = self.build()
+            event.built(query)
+
+            async with acquire(conn, self._writes) as conn, self._transaction(conn):
+                cursor = await (await self._cursor(conn, query, parameters))
+
+                while records := await cursor.fetch(chunk_size):
+                    count += len(records)
+                    reader.add(records)
+
+                await self._written(conn)
+
+            event.fetched(count)
+            columns_read = reader.finish()
 
-            if isinstance(column, tuple):
-                query_parts.append(f"order by {column._to_full_name()} {ty}")
+        return columns_read
 
-        if (limit := self._limit) is not None:
-            query_parts.append(f"limit {limit}")
+    def _column_index(self, column: Column[Any, Any]) -> int:
+        if column.table is self.table:
+            if (indexes := self._projection.get(self.table)) is None:
+                return column.index
 
-        return " ".join(query_parts), [where.value for _, where in self._wheres]
+            if column.index in indexes:
+                return indexes.index(column.index)
+
+        raise Exception(f"{column.table.__name__}.{column.name} is not selected by this query")
+
+    def paginate(
+        self,
+        by: Column[Any, Any] | tuple[Column[Any, Any], ...],
+        *,
+        after: str | None = None,
+        page_size: int = 50,
+        descending: bool = False,
+    ) -> PageQueryBuilder[T_T]:
+        return PageQueryBuilder(self, by if isinstance(by, tuple) else (by,), after, page_size, descending)
 
     def join(self, query: SelectQueryBuilder[T_OT]) -> TupleSelectQueryBuilder[T_T, *T_OT]:
         return TupleSelectQueryBuilder(self, query)
@@ -106,120 +470,285 @@ class SelectQueryBuilder(QueryBuilder[T_T], Generic[T_T]):
     def column(self, query: ColumnQueryBuilder[T]) -> TupleSelectQueryBuilder[T_T, T]:
         return TupleSelectQueryBuilder(self, query)
 
+    # grouped mode, only the group keys and aggregates are selected and come back as plain tuples
+    def key(self, column: Column[Any, T]) -> AggregateQueryBuilder[T_T, T]:
+        return AggregateQueryBuilder(self, column)
+
+    def aggregate(self, query: ColumnQueryBuilder[T]) -> AggregateQueryBuilder[T_T, T]:
+        return AggregateQueryBuilder(self, query)
+
 class TupleSelectQueryBuilder(SelectQueryBuilder[T_T], Generic[T_T, *Extras]):
     def __init__(self, select_query: SelectQueryBuilder[T_T], extra: SelectQueryBuilder[Any] | ColumnQueryBuilder[Any]):
         super().__init__(select_query.table)
         self._wheres = select_query._wheres
+        self._order = select_query._order
+        self._groups = select_query._groups
+        self._limit = select_query._limit
+        self._seek = select_query._seek
+        self._hydration = select_query._hydration
+        self._cache = select_query._cache
+        self._cache_ttl = select_query._cache_ttl
+        self._prefetch = select_query._prefetch
+        self._projection = dict(select_query._projection)
+        self._ctes = select_query._ctes
+        self._writes = select_query._writes
         self._extras: list[SelectQueryBuilder[Table] | ColumnQueryBuilder[Any]] = [extra]
 
+        if isinstance(extra, SelectQueryBuilder):
+            self._projection.update(extra._projection)
+
     def join(self, query: SelectQueryBuilder[T_OT]) -> TupleSelectQueryBuilder[T_T, *Extras, T_OT]:
         self._extras.append(query)
+        self._projection.update(query._projection)
         return cast(TupleSelectQueryBuilder[T_T, *Extras, T_OT], self)
 
+    def _joined_tables(self) -> list[type[Table]]:
+        return [self.table, *(extra.table for extra in self._extras if isinstance(extra, SelectQueryBuilder))]
+
     def column(self, query: ColumnQueryBuilder[T]) -> TupleSelectQueryBuilder[T_T, *Extras, T]:
         self._extras.append(query)
         return cast(TupleSelectQueryBuilder[T_T, *Extras, T], self)
 
-    def build(self) -> tuple[str, list[Any]]:
+    def _wheres_of(self) -> list[WhereQuery]:
+        wheres = super()._wheres_of()
+
+        for extra in self._extras:
+            if isinstance(extra, SelectQueryBuilder):
+                wheres.extend(where for _, where in extra._wheres)
+            elif extra._filter is not None:
+                wheres.append(extra._filter)
+
+        return wheres
+
+    def _bind_select(self, parameters: list[Any]) -> Hashable:
+        extras: list[Hashable] = [extra.table if isinstance(extra, SelectQueryBuilder) else extra._bind(parameters) for extra in self._extras]
+
+        for extra in self._extras:
+            if isinstance(extra, SelectQueryBuilder):
+                extras.append(bind_wheres(extra._wheres, parameters))
+
+        return (TupleSelectQueryBuilder, tuple(extras), super()._bind_select(parameters))
+
+    def _compile_select(self, compiler: Compiler) -> str:
         query_parts: list[str] = []
         columns: list[str] = []
-        values: list[Any] = []
 
-        for column in self.table._metadata.columns:
+        for column in self._selected(self.table):
             columns.append(f"{column._to_full_name()} as table_{self.table._metadata.name}_{column.name}")
 
         for i, extra in enumerate(self._extras):
             if isinstance(extra, SelectQueryBuilder):
-                for column in extra.table._metadata.columns:
+                for column in self._selected(extra.table):
                     columns.append(f"{column._to_full_name()} as table_{extra.table._metadata.name}_{column.name}")
             else:
-                extra_query, extra_values = extra.build()
-
-                columns.append(f"{extra_query} as extra_{i}")
-                values.extend(extra_values)
+                columns.append(f"{extra._compile(compiler)} as extra_{i}")
 
-        query_parts.append(f"select {','.join(columns)} from {self.table._metadata.name}")
+        query_parts.append(f"select {','.join(columns)} from \"{self.table._metadata.name}\"")
 
         for extra in self._extras:
             if isinstance(extra, SelectQueryBuilder):
-                wheres: list[str] = []
+                query_parts.append(f"inner join \"{extra.table._metadata.name}\" on {compile_wheres(extra._wheres, compiler)}")
 
-                for i, (joiner, where) in enumerate(extra._wheres, 1):
-                    if isinstance(where.value, Column):
-                        value = f"\"{where.value.table._metadata.name}\".\"{where.value.name}\""
-                    else:
-                        value = f"${len(values) + 1}"
-                        values.append(where.value)
+        query_parts.extend(self._compile_tail(compiler))
 
-                    if i == 1:
-                        wheres.append(f"{where.column._to_full_name()} {where.op} {value}")
-                    else:
-                        wheres.append(f"{joiner} {where.column._to_full_name()} {where.op} {value}")
+        return " ".join(query_parts)
 
-                query_parts.append(f"inner join \"{extra.table._metadata.name}\" on {' and '.join(wheres)}")
+    def _related_rows(self, rows: list[Any], column: Column[Any, Any]) -> list[Table]:
+        # prefetching works on whichever joined table the relation starts from
+        for i, (table, _, _) in enumerate(self._slice_plan()):
+            if table is not None and (table is column.table or (column.foreign and table is column.foreign.table)):
+                return [row[i] for row in rows]
 
-        wheres = []
+        return []
 
-        for i, (joiner, where) in enumerate(self._wheres, 1):
-            if isinstance(where.value, Column):
-                value = f"\"{where.value.table._metadata.name}\".\"{where.value.name}\""
-            else:
-                value = f"${len(values) + 1}"
-                values.append(where.value)
+    def _slice_plan(self) -> SlicePlan:
+        plan: list[tuple[type[Table] | None, int, tuple[int, ...] | None]] = []
+        offset = 0
 
-            if i == 1:
-                wheres.append(f"{where.column._to_full_name()} {where.op} {value}")
+        for extra in [self, *self._extras]:
+            if isinstance(extra, SelectQueryBuilder):
+                plan.append((extra.table, offset, self._projection.get(extra.table)))
+                offset += len(self._selected(extra.table))
             else:
-                wheres.append(f"{joiner} {where.column._to_full_name()} {where.op} {value}")
+                plan.append((None, offset, None))
+                offset += 1
 
-        query_parts.append(f"where {' '.join(wheres)}" if wheres else "")
+        return tuple(plan)
 
-        if groups := self._groups:
-            groups_query = ",".join([column._to_full_name() for column in groups])
-            query_parts.append(f"group by {groups_query}")
+    def _width(self) -> int | None:
+        return sum(1 if table is None else len(self._selected(table)) for table, _, _ in self._slice_plan())
 
-        if order := self._order:
-            column, ty = order
+    def _selected_columns(self) -> list[tuple[str, Column[Any, Any]]]:
+        return [
+            (f"{table._metadata.name}.{column.name}", column)
+            for table, _, _ in self._slice_plan()
+            if table is not None
+            for column in self._selected(table)
+        ]
 
-            if isinstance(column, tuple):
-                query_parts.append(f"order by {column._to_full_name()} {ty}")
+    def _column_index(self, column: Column[Any, Any]) -> int:
+        for table, offset, indexes in self._slice_plan():
+            if table is not None and column.table is table:
+                if indexes is None:
+                    return offset + column.index
 
-        if (limit := self._limit) is not None:
-            query_parts.append(f"limit {limit}")
+                if column.index in indexes:
+                    return offset + indexes.index(column.index)
 
-        query = " ".join(query_parts)
+                break
 
-        return query, values
+        raise Exception(f"{column.table.__name__}.{column.name} is not selected by this query")
+
+    def paginate(
+        self,
+        by: Column[Any, Any] | tuple[Column[Any, Any], ...],
+        *,
+        after: str | None = None,
+        page_size: int = 50,
+        descending: bool = False,
+    ) -> PageQueryBuilder[tuple[T_T, *Extras]]:
+        return PageQueryBuilder(self, by if isinstance(by, tuple) else (by,), after, page_size, descending)
 
-    def _build_record(self, record: Record) -> tuple[T_T, *Extras]:
-        collections: list[dict[str, Any] | Any] = []
-        last = None
+    def _hydrator(self) -> Callable[[Record], Any]:
+        if self._hydration == "raw":
+            return identity
 
-        for column, value in record.items():
-            column_type, rest = column.split("_", 1)
+        return join_hydrator(self._slice_plan(), self._hydration == "views")
 
-            if column_type == "table":
-                table_name, column_name = rest.split("_", 1)
+    def stream(self, conn: Executor, prefetch: int = 100) -> AsyncIterator[tuple[T_T, *Extras]]:
+        return cast(AsyncIterator[tuple[T_T, *Extras]], super().stream(conn, prefetch))
 
-                if last == table_name:
-                    collections[-1][column_name] = value
-                else:
-                    last = table_name
-                    collections.append({column_name: value})
+    def fetch_chunks(self, conn: Executor, size: int = 1000) -> AsyncIterator[list[tuple[T_T, *Extras]]]:
+        return cast(AsyncIterator[list[tuple[T_T, *Extras]]], super().fetch_chunks(conn, size))
+
+    async def fetchone(self, conn: Executor) -> tuple[T_T, *Extras] | None:
+        return cast(tuple[T_T, *Extras] | None, await super().fetchone(conn))
+
+    async def fetch(self, conn: Executor) -> list[tuple[T_T, *Extras]]:
+        return cast(list[tuple[T_T, *Extras]], await super().fetch(conn))
+
+class AggregateQueryBuilder(SelectQueryBuilder[T_T], Generic[T_T, *Extras]):
+    def __init__(self, select_query: SelectQueryBuilder[T_T], value: Column[Any, Any] | ColumnQueryBuilder[Any]):
+        if select_query._prefetch:
+            raise Exception("Related rows cannot be prefetched onto aggregates")
+
+        super().__init__(select_query.table)
+        self._wheres = select_query._wheres
+        self._order = select_query._order
+        self._groups = list(select_query._groups)
+        self._limit = select_query._limit
+        self._seek = select_query._seek
+        self._hydration = select_query._hydration
+        self._cache = select_query._cache
+        self._cache_ttl = select_query._cache_ttl
+        self._ctes = select_query._ctes
+        self._writes = select_query._writes
+        self._joins: list[SelectQueryBuilder[Any]] = []
+        self._values: list[Column[Any, Any] | ColumnQueryBuilder[Any]] = []
+
+        if isinstance(select_query, TupleSelectQueryBuilder):
+            for extra in select_query._extras:
+                if not isinstance(extra, SelectQueryBuilder):
+                    raise Exception("Cannot aggregate a query that already selects aggregate columns")
+
+                self._joins.append(extra)
+
+        self._add(value)
+
+    def _add(self, value: Column[Any, Any] | ColumnQueryBuilder[Any]) -> None:
+        if isinstance(value, Column):
+            if not any(value.table is table for table in self._joined_tables()):
+                raise Exception(f"{value.table.__name__}.{value.name} is not selected by this query")
+
+            # every key is grouped by, so a query with only aggregates reduces the whole table to one row
+            self._groups.append(value)
+
+        self._values.append(value)
+
+    def key(self, column: Column[Any, T]) -> AggregateQueryBuilder[T_T, *Extras, T]:
+        self._add(column)
+        return cast(AggregateQueryBuilder[T_T, *Extras, T], self)
+
+    def aggregate(self, query: ColumnQueryBuilder[T]) -> AggregateQueryBuilder[T_T, *Extras, T]:
+        self._add(query)
+        return cast(AggregateQueryBuilder[T_T, *Extras, T], self)
+
+    def prefetch(self, *columns: Column[Any, Any], chunk_size: int = 10_000) -> Self:
+        raise Exception("Related rows cannot be prefetched onto aggregates")
+
+    def _joined_tables(self) -> list[type[Table]]:
+        return [self.table, *(join.table for join in self._joins)]
+
+    def _wheres_of(self) -> list[WhereQuery]:
+        wheres = super()._wheres_of()
+        wheres.extend(where for join in self._joins for _, where in join._wheres)
+        wheres.extend(value._filter for value in self._values if isinstance(value, ColumnQueryBuilder) and value._filter is not None)
+
+        return wheres
+
+    def _bind_select(self, parameters: list[Any]) -> Hashable:
+        values: list[Hashable] = []
+
+        for value in self._values:
+            if isinstance(value, Column):
+                values.append(value._key)
             else:
-                collections.append(value)
+                values.append(value._bind(parameters))
+
+        joins = tuple((join.table, bind_wheres(join._wheres, parameters)) for join in self._joins)
+
+        return (AggregateQueryBuilder, tuple(values), joins, super()._bind_select(parameters))
+
+    def _compile_select(self, compiler: Compiler) -> str:
+        columns = ", ".join([value._to_full_name() if isinstance(value, Column) else value._compile(compiler) for value in self._values])
+        query_parts = [f"select {columns} from \"{self.table._metadata.name}\""]
+
+        for join in self._joins:
+            query_parts.append(f"inner join \"{join.table._metadata.name}\" on {compile_wheres(join._wheres, compiler)}")
+
+        query_parts.extend(self._compile_tail(compiler))
 
-        return cast(tuple[T_T, *Extras], tuple(collections))
+        return " ".join(query_parts)
+
+    def _hydrator(self) -> Callable[[Record], Any]:
+        if self._hydration == "rows":
+            return tuple
+
+        # records already read like tuples
+        return identity
+
+    def _width(self) -> int | None:
+        return len(self._values)
+
+    # only the keys, aggregates have no column type to read them into
+    def _selected_columns(self) -> list[tuple[str, Column[Any, Any]]]:
+        return [(f"{value.table._metadata.name}.{value.name}", value) for value in self._values if isinstance(value, Column)]
+
+    def _column_index(self, column: Column[Any, Any]) -> int:
+        for i, value in enumerate(self._values):
+            if value is column:
+                return i
+
+        raise Exception(f"{column.table.__name__}.{column.name} is not a key of this query")
+
+    def paginate(
+        self,
+        by: Column[Any, Any] | tuple[Column[Any, Any], ...],
+        *,
+        after: str | None = None,
+        page_size: int = 50,
+        descending: bool = False,
+    ) -> PageQueryBuilder[tuple[*Extras]]:
+        return PageQueryBuilder(self, by if isinstance(by, tuple) else (by,), after, page_size, descending)
 
-    async def fetchone(self, conn: Connection) -> tuple[T_T, *Extras] | None:
-        query, parameters = self.build()
-        record = await conn.fetchrow(query, *parameters)
+    def stream(self, conn: Executor, prefetch: int = 100) -> AsyncIterator[tuple[*Extras]]:
+        return cast(AsyncIterator[tuple[*Extras]], super().stream(conn, prefetch))
 
-        if record:
-            return self._build_record(record)
+    def fetch_chunks(self, conn: Executor, size: int = 1000) -> AsyncIterator[list[tuple[*Extras]]]:
+        return cast(AsyncIterator[list[tuple[*Extras]]], super().fetch_chunks(conn, size))
 
-    async def fetch(self, conn: Connection) -> list[tuple[T_T, *Extras]]:
-        query, parameters = self.build()
-        records = await conn.fetch(query, *parameters)
+    async def fetchone(self, conn: Executor) -> tuple[*Extras] | None:
+        return cast(tuple[*Extras] | None, await super().fetchone(conn))
 
-        return [self._build_record(record) for record in records]
+    async def fetch(self, conn: Executor) -> list[tuple[*Extras]]:
+        return cast(list[tuple[*Extras]], await super().fetch(conn))
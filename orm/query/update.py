@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Literal, overload
+from typing import Any, Hashable, Literal, overload
 
 from typing_extensions import Self
 
@@ -8,16 +8,22 @@ from ..column import Column
 from ..utils import T_T, T
 from ..where_query import WhereQuery
 from .base import QueryBuilder
+from .compiler import Compiler, bind_wheres, compile_wheres
 
 
 class UpdateQueryBuilder(QueryBuilder[T_T]):
+    _writes = True
+
     def __init__(self, table: type[T_T]) -> None:
         super().__init__(table)
         self._set: list[tuple[Column[Any, Any], Any]] = []
         self._wheres: list[tuple[str, WhereQuery]] = []
+        # the part of the shape set() decides, kept until the next set()
+        self._set_shape: Hashable | None = None
 
     def set(self, column: Column[Any, T], value: T) -> Self:
         self._set.append((column, value))
+        self._set_shape = None
         return self
 
     @overload
@@ -51,42 +57,31 @@ class UpdateQueryBuilder(QueryBuilder[T_T]):
     def and_where(self, query: WhereQuery) -> Self:
         return self.where("and", query)
 
-    def build(self) -> tuple[str, list[str]]:
+    def _bind(self, parameters: list[Any]) -> Hashable:
+        if (shape := self._set_shape) is None:
+            shape = self._set_shape = (UpdateQueryBuilder, self.table, tuple([column._key for column, _ in self._set]))
+
+        for _, value in self._set:
+            parameters.append(value)
+
+        return (shape, bind_wheres(self._wheres, parameters))
+
+    def _compile(self, compiler: Compiler) -> str:
         query_parts: list[str] = []
-        values: list[Any] = []
 
         query_parts.append(f"update \"{self.table._metadata.name}\"")
 
         sets: list[str] = []
 
         for column, value in self._set:
-            value = f"${len(values) + 1}"
-            values.append(value)
-
-            sets.append(f"{column._to_full_name()} = {value}")
+            sets.append(f"\"{column.name}\" = {compiler.param(value)}")
 
         query_parts.append(f"set {','.join(sets)}")
 
-        wheres: list[str] = []
-
-        for i, (joiner, where) in enumerate(self._wheres, 1):
-            if isinstance(where.value, Column):
-                value = f"\"{where.value.table._metadata.name}\".\"{where.value.name}\""
-            else:
-                value = f"${len(values) + 1}"
-                values.append(where.value)
-
-            if i == 1:
-                wheres.append(f"{where.column._to_full_name()} {where.op} {value}")
-            else:
-                wheres.append(f"{joiner} {where.column._to_full_name()} {where.op} {value}")
-
-        if wheres:
-            query_parts.append(f"where {' '.join(wheres)}")
+        if self._wheres:
+            query_parts.append(f"where {compile_wheres(self._wheres, compiler)}")
 
-        query_parts.append("returning *")
+        columns = ",".join([f"\"{column.name}\"" for column in self.table._metadata.columns])
+        query_parts.append(f"returning {columns}")
 
-        return (
-            " ".join(query_parts),
-            values,
-        )
+        return " ".join(query_parts)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Collection, Hashable, Iterable
+
+from typing_extensions import Self
+
+from ..utils import T_T
+from .base import QueryBuilder
+from .compiler import Compiler, bind_arrays, compile_arrays
+from .insert import column_value
+
+if TYPE_CHECKING:
+    from asyncpg import Record
+
+    from ..column import Column
+    from ..utils import Executor
+
+
+class UpsertQueryBuilder(QueryBuilder[T_T]):
+    _writes = True
+
+    def __init__(self, table: type[T_T], rows: Iterable[T_T]) -> None:
+        super().__init__(table)
+        # every build reads the rows again
+        self.rows = rows if isinstance(rows, Collection) else list(rows)
+        self._conflict: list[Column[Any, Any]] = table._metadata.primary
+        self._update: list[Column[Any, Any]] | None = None
+        self._nothing = False
+        self._only_changed = False
+        self._returning = False
+        self._keys: list[Any] | None = None
+
+    def _check(self, columns: tuple[Column[Any, Any], ...]) -> list[Column[Any, Any]]:
+        for column in columns:
+            if column.table is not self.table:
+                raise Exception(f"{column.table.__name__}.{column.name} is not a column of {self.table.__name__}")
+
+        return list(columns)
+
+    # the columns of the primary key or unique constraint that decides whether a row already exists
+    def on_conflict(self, *columns: Column[Any, Any]) -> Self:
+        self._conflict = self._check(columns)
+        return self
+
+    # columns overwritten on existing rows, every column outside the conflict target by default
+    def update(self, *columns: Column[Any, Any]) -> Self:
+        self._update = self._check(columns)
+        self._nothing = False
+        return self
+
+    def do_nothing(self) -> Self:
+        self._nothing = True
+        return self
+
+    # skips rows whose values already match, so they dont leave a dead tuple behind or show up in returning
+    def only_changed(self) -> Self:
+        self._only_changed = True
+        return self
+
+    def _updated(self) -> list[Column[Any, Any]]:
+        if self._update is not None:
+            return self._update
+
+        return [column for column in self.table._metadata.columns if not any(column is conflict for conflict in self._conflict)]
+
+    def _bind(self, parameters: list[Any]) -> Hashable:
+        if not self._conflict:
+            raise Exception(f"{self.table.__name__} has no primary key, pass the conflict columns to on_conflict")
+
+        columns = self.table._metadata.columns
+        indexes = [conflict.index for conflict in self._conflict]
+
+        # postgres refuses to update the same row twice in one statement, so a later row with the same
+        # conflict key replaces an earlier one
+        records: dict[Any, tuple[Any, ...]] = {}
+
+        for row in self.rows:
+            record = tuple(column_value(self.table, row, column) for column in columns)
+            records[tuple(record[index] for index in indexes)] = record
+
+        bind_arrays(list(records.values()), range(len(columns)), parameters)
+
+        primary = self.table._metadata.primary
+        self._keys = [record[primary[0].index] for record in records.values()] if len(primary) == 1 else None
+
+        return (
+            UpsertQueryBuilder,
+            self.table,
+            tuple(column.name for column in self._conflict),
+            None if self._nothing else tuple(column.name for column in self._updated()),
+            self._only_changed,
+            self._returning,
+        )
+
+    def _written_keys(self, records: list[Record] | None) -> list[Any] | None:
+        return self._keys
+
+    def _compile(self, compiler: Compiler) -> str:
+        table = f"\"{self.table._metadata.name}\""
+        columns = self.table._metadata.columns
+
+        arrays = compile_arrays(columns, compiler)
+        names = ",".join([f"\"{column.name}\"" for column in columns])
+        conflict = ",".join([f"\"{column.name}\"" for column in self._conflict])
+
+        query = f"insert into {table}({names}) select * from unnest({arrays}) on conflict ({conflict}) "
+        updated = self._updated()
+
+        if self._nothing or not updated:
+            query += "do nothing"
+        else:
+            query += "do update set " + ", ".join([f"\"{column.name}\" = excluded.\"{column.name}\"" for column in updated])
+
+            if self._only_changed:
+                current = ", ".join([column._to_full_name() for column in updated])
+                excluded = ", ".join([f"excluded.\"{column.name}\"" for column in updated])
+                query += f" where ({current}) is distinct from ({excluded})"
+
+        if self._returning:
+            query += f" returning {names}"
+
+        return query
+
+    # rows that were inserted or updated, skipped rows (do_nothing, only_changed) arent returned
+    async def fetch(self, conn: Executor) -> list[T_T]:
+        self._returning = True
+        return await super().fetch(conn)
+
+    async def fetchone(self, conn: Executor) -> T_T | None:
+        self._returning = True
+        return await super().fetchone(conn)
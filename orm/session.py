@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from .query import BatchDeleteQueryBuilder, BatchUpdateQueryBuilder, BulkInsertQueryBuilder, SelectQueryBuilder, notifier
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from .table import Table
+    from .utils import Connection
+
+__all__ = ("Session",)
+
+T_R = TypeVar("T_R", bound="Table")
+
+
+def _clean(row: Table) -> None:
+    if dirty := getattr(row, "_dirty", None):
+        dirty.clear()
+
+
+class Session:
+    def __init__(self, conn: Connection) -> None:
+        self.conn = conn
+        self._identity: dict[tuple[type[Table], Any], Table] = {}
+        self._new: list[Table] = []
+        self._deleted: list[Table] = []
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None) -> None:
+        if exc_type is None:
+            await self.flush()
+
+    def _key(self, row: Table) -> tuple[type[Table], Any]:
+        table = type(row)
+        return (table, row._values[table._metadata.primary_key.index])
+
+    def _merge(self, row: T_R) -> T_R:
+        # rows already in the session win, otherwise a refetch would throw away pending changes
+        return self._identity.setdefault(self._key(row), row)  # type: ignore
+
+    async def get(self, table: type[T_R], key: Any) -> T_R | None:
+        if (row := self._identity.get((table, key))) is not None:
+            return row  # type: ignore
+
+        row = await table.select().where(table._metadata.primary_key == key).fetchone(self.conn)
+
+        if row is not None:
+            return self._merge(row)
+
+    async def fetch(self, query: SelectQueryBuilder[T_R]) -> list[T_R]:
+        return [self._merge(row) for row in await query.fetch(self.conn)]
+
+    async def fetchone(self, query: SelectQueryBuilder[T_R]) -> T_R | None:
+        row = await query.fetchone(self.conn)
+
+        if row is not None:
+            return self._merge(row)
+
+    def add(self, row: Table) -> None:
+        self._new.append(row)
+
+    def delete(self, row: Table) -> None:
+        if row in self._new:
+            self._new.remove(row)
+        else:
+            self._deleted.append(row)
+
+    @property
+    def dirty(self) -> list[Table]:
+        return [row for row in self._identity.values() if getattr(row, "_dirty", None)]
+
+    async def flush(self) -> None:
+        inserts: dict[type[Table], list[Table]] = {}
+        updates: dict[tuple[type[Table], tuple[int, ...]], list[Table]] = {}
+        deletes: dict[type[Table], list[Any]] = {}
+
+        for row in self._new:
+            inserts.setdefault(type(row), []).append(row)
+
+        for row in self._deleted:
+            deletes.setdefault(type(row), []).append(self._key(row)[1])
+
+        for row in self.dirty:
+            if row in self._deleted:
+                continue
+
+            table = type(row)
+            indexes = tuple(sorted(row._dirty))
+
+            if table._metadata.primary_key.index in indexes:
+                raise Exception(f"Cannot change the primary key of {table.__name__} in a session")
+
+            updates.setdefault((table, indexes), []).append(row)
+
+        if not (inserts or updates or deletes):
+            return
+
+        async with notifier.batch(self.conn):
+            for table, rows in inserts.items():
+                await BulkInsertQueryBuilder(table, rows).execute(self.conn)
+
+            for (table, indexes), rows in updates.items():
+                columns = [table._metadata.columns[index] for index in indexes]
+                await BatchUpdateQueryBuilder(table, columns, rows).execute(self.conn)
+
+            # delete in reverse so rows referencing other tables tend to go first
+            for table, keys in reversed(deletes.items()):
+                await BatchDeleteQueryBuilder(table, keys).execute(self.conn)
+
+        # everything is committed, nothing after this point may send the same rows again
+        new, deleted = self._new, self._deleted
+        self._new, self._deleted = [], []
+
+        for row in new:
+            _clean(row)
+            self._merge(row)
+
+        for rows in updates.values():
+            for row in rows:
+                _clean(row)
+
+        for row in deleted:
+            self._identity.pop(self._key(row), None)
@@ -1,26 +1,64 @@
 from __future__ import annotations
 
-from typing import Annotated, Any, ClassVar, Self, get_args, get_origin, get_type_hints
+from typing import TYPE_CHECKING, Annotated, Any, AsyncIterable, ClassVar, Iterable, Self, get_args, get_origin, get_type_hints
 
 from typing_extensions import Self
 
 from .column import Column, ColumnBuilder
-from .query import CreateTableQueryBuilder, InsertQueryBuilder, SelectQueryBuilder, UpdateQueryBuilder, DeleteQueryBuilder
-from .utils import eval_annotation
+from .indexes import Index
+from .query import BulkInsertQueryBuilder, CopyFromQueryBuilder, CreateIndexQueryBuilder, CreateTableQueryBuilder, InsertQueryBuilder, Loader, SelectQueryBuilder, UpdateQueryBuilder, UpsertQueryBuilder, DeleteQueryBuilder
+from .utils import Missing, eval_annotation
 from .where_query import WhereQuery
 
+if TYPE_CHECKING:
+    from .query.copy import CopyFormat
+    from .utils import Executor
+
 __all__ = ("TableMetadata", "Table")
 
 
 class TableMetadata:
-    def __init__(self, name: str, columns: list[Column[Any, Any]]) -> None:
+    def __init__(self, name: str, columns: list[Column[Any, Any]], indexes: list[Index] | None = None) -> None:
         self.name = name
         self.columns = columns
-        self.values: dict[str, Any] = {}
+        self.primary = [column for column in columns if column.primary]
+        self.indexes = indexes or []
+
+    @property
+    def primary_key(self) -> Column[Any, Any]:
+        if len(self.primary) != 1:
+            raise Exception(f"{self.name} needs exactly one primary key column")
+
+        return self.primary[0]
+
+
+def _generate_init(columns: list[Column[Any, Any]]) -> Any:
+    # column names can never start with an underscore so these cant clash with a column
+    args = ", ".join(f"{column.name}=_Missing" for column in columns)
+    values = ", ".join(column.name for column in columns)
+
+    source = f"def __init__(_self, *, {args}):\n    _self._values = [{values}]\n"
+    namespace: dict[str, Any] = {}
+    exec(source, {"_Missing": Missing}, namespace)
+
+    return namespace["__init__"]
 
 
-class Table:
+class _TableMeta(type):
+    # a subclass without __slots__ of its own gets a __dict__ and __weakref__ on every row,
+    # column values live in _values so there is nothing for them to hold
+    def __new__(mcs, name: str, bases: tuple[type, ...], namespace: dict[str, Any], **kwargs: Any) -> _TableMeta:
+        namespace.setdefault("__slots__", ())
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+
+class Table(metaclass=_TableMeta):
+    __slots__ = ("_values", "_dirty", "_related")
+
     _metadata: ClassVar[TableMetadata]
+    _values: list[Any]
+    _dirty: set[int]
+    _related: dict[str, Any]
 
     def __init_subclass__(cls, *, table_name: str | None = None) -> None:
         columns: list[Column[Any, Any]] = []
@@ -47,23 +85,53 @@ class Table:
             column_builder._db_type = get_args(db_ty)[0]
 
             column = column_builder.build()
+            column.index = len(columns)
             columns.append(column)
 
             setattr(cls, key, column)
 
         cls._metadata = TableMetadata(table_name or cls.__name__, columns)
 
+        # primary keys already come with their own unique index
+        indexes = [Index(column, unique=column.unique) for column in columns if (column.indexed or column.unique) and not column.primary]
+        indexes.extend(cls.__indexes__())
+
+        for index in indexes:
+            for column in [*index.columns, *index.include]:
+                if column.table is not cls:
+                    raise Exception(f"Cannot index {column.table.__name__}.{column.name} on {cls.__name__}")
+
+        cls._metadata.indexes = indexes
+
+        if "__init__" not in cls.__dict__:
+            cls.__init__ = _generate_init(columns)
+
+    # indexes that need more than a marker on one column, called once the columns exist
+    #   return [orm.Index(cls.author, cls.id), orm.Index(cls.email, unique=True, where=cls.deleted == None)]
+    @classmethod
+    def __indexes__(cls) -> list[Index]:
+        return []
+
     # i really wish there was a way to statically type the kwargs
     # if dataclass_transform let me map the values this could be possible
 
     def __init__(self, **kwargs: Any):
-        self._metadata.values = kwargs
+        # replaced on every subclass with a generated keyword only __init__, this is only here for type checkers
+        self._values = [kwargs.get(column.name, Missing) for column in self._metadata.columns]
 
     def __repr__(self) -> str:
-        attrs = " ".join(f"{k}={v!r}" for k, v in self._metadata.values.items())
+        attrs = " ".join(f"{column.name}={value!r}" for column, value in zip(self._metadata.columns, self._values) if value is not Missing)
 
         return f"<{self.__class__.__name__} {attrs}>"
 
+    # rows loaded by SelectQueryBuilder.prefetch, a single row (or None) when following this tables
+    # foreign key and a list of rows when following another tables foreign key back to this one
+    def related(self, column: Column[Any, Any]) -> Any:
+        try:
+            return self._related[column._to_full_name()]
+        except (AttributeError, KeyError):
+            raise AttributeError(f"{column.table.__name__}.{column.name} was not prefetched") from None
+
     @classmethod
     def select(cls) -> SelectQueryBuilder[Self]:
         return SelectQueryBuilder(cls)
@@ -72,10 +140,23 @@ class Table:
     def where(cls, where: WhereQuery) -> SelectQueryBuilder[Self]:
         return cls.select().where(where)
 
+    # coalesces primary key lookups made in the same event loop tick into one query, meant to live for a single request
+    @classmethod
+    def loader(cls, conn: Executor, *, max_batch_size: int = 1000, memo: bool = True) -> Loader[Self]:
+        return Loader(cls, conn, max_batch_size=max_batch_size, memo=memo)
+
     @classmethod
     def create(cls) -> CreateTableQueryBuilder[Self]:
         return CreateTableQueryBuilder(cls)
 
+    # one statement per declared index, run them one by one, concurrent builds cant share a transaction
+    @classmethod
+    def create_indexes(cls, *, concurrently: bool = False, if_not_exists: bool = False) -> list[CreateIndexQueryBuilder[Self]]:
+        return [
+            CreateIndexQueryBuilder(cls, index, concurrently=concurrently, if_not_exists=if_not_exists)
+            for index in cls._metadata.indexes
+        ]
+
     @classmethod
     def update(cls) -> UpdateQueryBuilder[Self]:
         return UpdateQueryBuilder(cls)
@@ -83,6 +164,28 @@ class Table:
     def insert(self) -> InsertQueryBuilder[Self]:
         return InsertQueryBuilder(self)
 
+    @classmethod
+    def insert_many(cls, rows: Iterable[Self] | AsyncIterable[Self], *, chunk_size: int = 10_000) -> BulkInsertQueryBuilder[Self]:
+        return BulkInsertQueryBuilder(cls, rows, chunk_size)
+
+    # insert ... on conflict for any number of rows in one statement, updating every non key column by default
+    @classmethod
+    def upsert(cls, rows: Iterable[Self]) -> UpsertQueryBuilder[Self]:
+        return UpsertQueryBuilder(cls, rows)
+
+    # loads rows through COPY from a path, a file object (sync or async) or an async iterable of bytes
+    @classmethod
+    async def copy_from(
+        cls,
+        conn: Executor,
+        source: Any,
+        *,
+        columns: list[Column[Any, Any]] | None = None,
+        format: CopyFormat = "binary",
+        header: bool | None = None,
+    ) -> int:
+        return await CopyFromQueryBuilder(cls, source, columns=columns, format=format, header=header).execute(conn)
+
     @classmethod
     def delete(cls) -> DeleteQueryBuilder[Self]:
         return DeleteQueryBuilder(cls)
@@ -6,8 +6,13 @@ import asyncpg
 
 if TYPE_CHECKING:
     Connection = asyncpg.Connection[asyncpg.Record]
+    Pool = asyncpg.Pool[asyncpg.Record]
+    from .query.router import Router
     from .table import Table
 
+    # anything the builders can run against, pools and routers get a connection acquired per query
+    Executor = Connection | Pool | Router
+
 T = TypeVar("T")
 T_T = TypeVar("T_T", bound="Table", covariant=True)
 T_OT = TypeVar("T_OT", bound="Table", covariant=True)
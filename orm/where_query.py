@@ -1,15 +1,85 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Hashable
 
 if TYPE_CHECKING:
     from .column import Column
+    from .query.compiler import Compiler
 
-__all__ = ("WhereQuery",)
+__all__ = ("WhereQuery", "WhereGroup", "Subquery", "Exists", "exists")
+
+
+class Subquery:
+    # builders that can be embedded in another query, they are bound and compiled along with the
+    # outer one so every placeholder is numbered by the same compiler
+    _writes: bool = False
+
+    def _bind(self, parameters: list[Any]) -> Hashable:
+        raise NotImplementedError
+
+    def _compile(self, compiler: Compiler) -> str:
+        raise NotImplementedError
+
+    # tables the results are read from, for result cache invalidation
+    def _tables(self) -> set[str]:
+        raise NotImplementedError
+
+    # how many columns each row has, None when it isnt known
+    def _width(self) -> int | None:
+        return None
+
+
+def _read_only(query: Subquery) -> Subquery:
+    # postgres only takes data modifying statements in a with clause
+    if query._writes:
+        raise Exception("Inserts, updates and deletes cannot be used as a subquery, wrap them in cte() and pass that to with_()")
+
+    return query
 
 
 class WhereQuery:
+    # filled in by the compiler the first time a comparison against a plain value is bound
+    _shape: Hashable | None = None
+
     def __init__(self, column: Column[Any, Any], value: Any, op: str):
         self.column = column
         self.value = value
         self.op = op
+
+    def __and__(self, other: WhereQuery) -> WhereGroup:
+        return WhereGroup.of("and", self, other)
+
+    def __or__(self, other: WhereQuery) -> WhereGroup:
+        return WhereGroup.of("or", self, other)
+
+    def __invert__(self) -> WhereGroup:
+        return WhereGroup("not", [self])
+
+
+class WhereGroup(WhereQuery):
+    # compiled inside parentheses, `a & b & c` is kept as one group instead of nesting
+    def __init__(self, joiner: str, children: list[WhereQuery]) -> None:
+        self.joiner = joiner
+        self.children = children
+
+    @classmethod
+    def of(cls, joiner: str, *wheres: WhereQuery) -> WhereGroup:
+        children: list[WhereQuery] = []
+
+        for where in wheres:
+            if isinstance(where, WhereGroup) and where.joiner == joiner:
+                children.extend(where.children)
+            else:
+                children.append(where)
+
+        return cls(joiner, children)
+
+
+class Exists(WhereQuery):
+    # has no column of its own, a subquery referring to the outer tables in its where is correlated with them
+    def __init__(self, query: Subquery) -> None:
+        super().__init__(None, _read_only(query), "exists")  # type: ignore[arg-type]
+
+
+def exists(query: Subquery) -> Exists:
+    return Exists(query)